@@ -1,193 +1,79 @@
 import streamlit as st
-import pandas as pd
-import openpyxl
-from io import BytesIO
+import copy
 import os
-from datetime import datetime, date, time, timedelta
-import calendar
-import re
+from datetime import datetime, date, time
 
-# Librerías para PDF
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+from nucleo import medicion
+from nucleo.cache import CacheLRU, huella_reporte
+from nucleo.catalogo import CatalogoEnSegundoPlano, FuenteArchivo, FuenteGoogleSheets
+from nucleo.festivos import festivos_mes, nombre_festivo
+from nucleo.fichas import aplicar_herencia, aplicar_tabla, tabla_fichas
+from nucleo.historico import HistoricoReportes
+from nucleo.horario import DIAS_NOM, leer_horario
+from nucleo.horas import MESES, dias_del_mes as calcular_dias_del_mes, calcular_horas, calendario_mes
+from nucleo.render import MAX_COLA, WORKERS, PoolRender
+
+# Tiempos por etapa de este rerun; REPORTE_DEBUG=1 o ?debug=1 los muestra en
+# la barra lateral y REPORTE_PERFIL=cprofile|pyinstrument perfila cada rerun.
+medicion.iniciar_corrida("app.rerun")
 
 # ==========================================
 # MOTOR DE BASE DE DATOS - GOOGLE SHEETS
 # ==========================================
-@st.cache_data(ttl=600)
+# Copia local en SQLite (arranca sin red); la hoja solo se vuelve a procesar
+# si cambió. REPORTE_CATALOGO_CSV permite usar un CSV local como fuente.
+# Se comparte como recurso (sin copiar el catálogo en cada rerun) junto con su
+# índice de búsqueda, que solo se rearma cuando cambia el contenido. La
+# consulta a la fuente corre en segundo plano: la página no espera a la red.
+@st.cache_resource
 def cargar_competencias_gsheets():
-    sheet_id = "1MAIAGFEBerD3Gg-WYfOMvTXQ0uj7JO8UZBag0e8sxjw"
-    url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-    try:
-        df = pd.read_csv(url)
-        df.fillna("", inplace=True) 
-        base_datos = {}
-        for _, fila in df.iterrows():
-            comp = str(fila.iloc[0]).strip()
-            rap = str(fila.iloc[1]).strip() if len(fila) > 1 else ""
-            if comp != "" and comp.lower() != "nan" and "unnamed" not in comp.lower():
-                if comp not in base_datos:
-                    base_datos[comp] = []
-                if rap != "" and rap.lower() != "nan" and "unnamed" not in rap.lower():
-                    base_datos[comp].append(rap)
-        base_datos["OTRA (Escribir manualmente)"] = []
-        return base_datos
-    except:
-        return {"OTRA (Escribir manualmente)": []}
-
-DB_SENA = cargar_competencias_gsheets()
+    csv_local = os.environ.get("REPORTE_CATALOGO_CSV")
+    return CatalogoEnSegundoPlano(FuenteArchivo(csv_local) if csv_local else FuenteGoogleSheets(), max_edad=600)
 
-# ==========================================
-# MOTOR DE EXPORTACIÓN A PDF
-# ==========================================
-def crear_pdf(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=[]):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
-    elements = []
-    
-    styles = getSampleStyleSheet()
-    style_center = ParagraphStyle(name='Center', parent=styles['Normal'], alignment=1, fontSize=11, leading=14)
-    style_title = ParagraphStyle(name='Title', parent=styles['Heading1'], alignment=1, fontSize=14, spaceAfter=12)
-    style_cell = ParagraphStyle(name='Cell', parent=styles['Normal'], fontSize=8, leading=10)
-    style_subtitle = ParagraphStyle(name='Sub', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', spaceAfter=6, spaceBefore=10)
+CATALOGO = cargar_competencias_gsheets()
+INDICE_SENA = CATALOGO.indice()
 
-    if os.path.exists("logo_sena.png"):
-        img = Image("logo_sena.png", width=0.7*inch, height=0.7*inch)
-        img.hAlign = 'CENTER'
-        elements.append(img)
-    
-    elements.append(Paragraph("<b>CENTRO INDUSTRIAL Y DE ENERGIAS ALTERNATIVAS - REGIONAL GUAJIRA</b>", style_center))
-    elements.append(Paragraph("<b>REPORTE ESTADISTICO DE HORAS MENSUALES INSTRUCTOR</b>", style_title))
-    
-    info_text = f"<b>INSTRUCTOR:</b> {nombre} &nbsp;&nbsp;&nbsp;&nbsp; <b>CÉDULA:</b> {cedula} &nbsp;&nbsp;&nbsp;&nbsp; <b>MES:</b> {mes} / {anio}"
-    elements.append(Paragraph(info_text, styles['Normal']))
-    
-    # ========================================
-    # CALCULAR TOTAL DE HORAS POR FICHA
-    # ========================================
-    horas_por_ficha = {}
-    for f in datos_formacion:
-        ficha = f['ficha']
-        if ficha not in horas_por_ficha:
-            horas_por_ficha[ficha] = 0
-        horas_por_ficha[ficha] += f['horas']
-    
-    # 1. TABLA DIRECTA — con columna HRS MES fusionada por ficha
-    elements.append(Paragraph("PARTE HORAS DIRECTAS - PROGRAMAS EN FORMACIÓN TITULADA", style_subtitle))
-    data_table = [["FICHA", "DESDE", "HASTA", "L", "M", "MI", "J", "V", "S", "COMPETENCIA", "RAP", "EVAL", "TERM", "HRS", "HRS MES"]]
-    
-    # Rastrear filas por ficha para hacer el merge
-    ficha_filas = {}  # ficha -> [lista de índices de fila en data_table]
-    
-    for idx_f, f in enumerate(datos_formacion):
-        row_idx = idx_f + 1  # +1 porque fila 0 es el header
-        ficha = f['ficha']
-        if ficha not in ficha_filas:
-            ficha_filas[ficha] = []
-        ficha_filas[ficha].append(row_idx)
-    
-    # Determinar qué filas son "primera de su grupo contiguo" para mostrar el valor
-    filas_con_valor = set()
-    for ficha, filas_idx in ficha_filas.items():
-        if len(filas_idx) == 1:
-            filas_con_valor.add(filas_idx[0])
-        else:
-            # Primera fila de cada bloque contiguo muestra el total
-            filas_con_valor.add(filas_idx[0])
-            for k in range(1, len(filas_idx)):
-                if filas_idx[k] != filas_idx[k-1] + 1:
-                    filas_con_valor.add(filas_idx[k])
-    
-    for idx_f, f in enumerate(datos_formacion):
-        row_idx = idx_f + 1
-        ficha = f['ficha']
-        valor_hrs_mes = f"{horas_por_ficha.get(ficha, 0):g}" if row_idx in filas_con_valor else ""
-        
-        row = [
-            f['ficha'],
-            f['h_inicio'].strftime("%H:%M"),
-            f['h_fin'].strftime("%H:%M"),
-            "X" if f['dias']["L"] else "",
-            "X" if f['dias']["M"] else "",
-            "X" if f['dias']["Mi"] else "",
-            "X" if f['dias']["J"] else "",
-            "X" if f['dias']["V"] else "",
-            "X" if f['dias']["S"] else "",
-            Paragraph(f['competencia'], style_cell),
-            Paragraph(f['rap'], style_cell),
-            f.get('evaluado', 'NO'),
-            f.get('termino', 'NO'),
-            f"{f['horas']:g}",
-            valor_hrs_mes
-        ]
-        data_table.append(row)
-    data_table.append(["", "", "", "", "", "", "", "", "", "", "", "", "", "TOTAL:", f"{tot_dir:g}"])
-
-    t_dir = Table(data_table, colWidths=[45, 35, 35, 15, 15, 15, 15, 15, 15, 180, 190, 30, 30, 25, 35])
-    
-    # Estilos base
-    estilos_tabla = [
-        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.black),
-        ('FONTSIZE', (0,0), (-1,-1), 8),
-        ('BACKGROUND', (-1,1), (-1,-2), colors.Color(0.93, 0.97, 1.0)),
-        ('FONTNAME', (-1,0), (-1,0), 'Helvetica-Bold'),
-    ]
-    
-    # Fusionar celdas HRS MES solo para filas CONTIGUAS de la misma ficha
-    col_hrs_mes = 14  # índice de la columna HRS MES (0-based)
-    for ficha, filas_idx in ficha_filas.items():
-        if len(filas_idx) > 1:
-            # Agrupar en bloques contiguos (por si la misma ficha no está junta)
-            grupos = []
-            grupo_actual = [filas_idx[0]]
-            for k in range(1, len(filas_idx)):
-                if filas_idx[k] == filas_idx[k-1] + 1:
-                    grupo_actual.append(filas_idx[k])
-                else:
-                    grupos.append(grupo_actual)
-                    grupo_actual = [filas_idx[k]]
-            grupos.append(grupo_actual)
-            
-            for grupo in grupos:
-                if len(grupo) > 1:
-                    estilos_tabla.append(('SPAN', (col_hrs_mes, grupo[0]), (col_hrs_mes, grupo[-1])))
-                    estilos_tabla.append(('FONTNAME', (col_hrs_mes, grupo[0]), (col_hrs_mes, grupo[-1]), 'Helvetica-Bold'))
-    
-    t_dir.setStyle(TableStyle(estilos_tabla))
-    elements.append(t_dir)
-    
-    if datos_otras:
-        elements.append(Spacer(1, 15))
-        elements.append(Paragraph("PARTE OTRAS ACTIVIDADES INSTRUCTORES PLANTA", style_subtitle))
-        data_otras = [["ACTIVIDAD", "FECHA DESDE", "FECHA HASTA", "CANT. DÍAS", "HRS"]]
-        for of in datos_otras:
-            data_otras.append([of['actividad'], of['f_desde'].strftime("%d/%m/%Y"), of['f_hasta'].strftime("%d/%m/%Y"), f"{of['dias']:g}", f"{of['horas']:g}"])
-        data_otras.append(["", "", "", "TOTAL OTRAS:", f"{tot_otr:g}"])
-        t_otras = Table(data_otras, colWidths=[250, 110, 110, 100, 80])
-        t_otras.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 0.5, colors.black), ('ALIGN', (0,0), (-1,-1), 'CENTER')]))
-        elements.append(t_otras)
-    
-    elements.append(Spacer(1, 20))
-    elements.append(Paragraph(f"<b>TOTAL HORAS REPORTADAS EN EL MES: &nbsp; {tot_gen:g} Horas</b>", style_center))
-
-    # --- NOVEDADES GLOBALES EN EL PDF ---
-    if novedades_globales:
-        elements.append(Spacer(1, 10))
-        nov_texto = ", ".join([n.strftime("%d/%m/%Y") for n in novedades_globales])
-        elements.append(Paragraph(f"<font color=red><b>Novedades/Festivos aplicados:</b></font> {nov_texto}", style_cell))
-    
-    fecha_gen = datetime.now().strftime("%d/%m/%Y %I:%M %p")
-    firma_html = f"<br/><br/><br/>_________________________________<br/><b>FIRMA DEL INSTRUCTOR</b><br/>{nombre}<br/>C.C. {cedula}<br/><br/><font size=8 color=gray>Reporte generado el: {fecha_gen}</font>"
-    elements.append(Paragraph(firma_html, style_center))
-    
-    doc.build(elements)
-    return buffer.getvalue()
+# Selectores con búsqueda: al navegador solo viajan hasta MAX_OPCIONES
+# coincidencias (más la opción elegida), no el catálogo completo.
+MAX_OPCIONES = 30
+
+def selector_buscable(etiqueta, indice, actual, key):
+    consulta = ""
+    if len(indice) > MAX_OPCIONES:
+        consulta = st.text_input(f"🔎 Buscar {etiqueta.lower()}", key=f"q{key}",
+                                 placeholder="Escriba palabras o el inicio de ellas (sin importar tildes)")
+    opciones = indice.buscar(consulta, MAX_OPCIONES)
+    if actual in indice and actual not in opciones:
+        opciones.insert(0, actual)
+    if not opciones:
+        st.caption(f"Sin coincidencias para \"{consulta}\".")
+        return actual
+    if len(indice) > len(opciones):
+        st.caption(f"Mostrando {len(opciones)} de {len(indice)} opciones; escriba para filtrar.")
+    idx = opciones.index(actual) if actual in opciones else 0
+    return st.selectbox(etiqueta, opciones, index=idx, key=key)
+
+# Caché de horarios compartida por todas las sesiones; REPORTE_CACHE_HORARIOS
+# apunta a una carpeta para conservarla entre reinicios.
+@st.cache_resource
+def cache_horarios():
+    return CacheLRU(max_entradas=64, directorio=os.environ.get("REPORTE_CACHE_HORARIOS"))
+
+# PDF y Excel ya generados, por huella de los datos del reporte. Cabe al
+# menos un resultado por pedido que el pool puede tener pendiente.
+@st.cache_resource
+def cache_pdfs():
+    return CacheLRU(max_entradas=WORKERS + MAX_COLA)
+
+# Pool de render compartido por todas las sesiones (REPORTE_RENDER_WORKERS, REPORTE_RENDER_COLA)
+@st.cache_resource
+def pool_render():
+    return PoolRender(cache=cache_pdfs())
+
+# Histórico de reportes descargados (estadísticas del centro: python -m nucleo.historico)
+@st.cache_resource
+def historico():
+    return HistoricoReportes()
 
 # ==========================================
 # INTERFAZ STREAMLIT
@@ -234,7 +120,7 @@ with st.container():
     c1, c2, c3, c4 = st.columns(4)
     nombre_ins = c1.text_input("Nombre del Instructor")
     cedula_ins = c2.text_input("Cédula")
-    meses_str = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+    meses_str = MESES
     mes_rep = c3.selectbox("Mes del Reporte", meses_str, index=datetime.now().month - 1)
     anio_rep = c4.text_input("Año", value="2026")
     
@@ -243,161 +129,126 @@ st.markdown("### 🗓️ Configuración de Novedades (Festivos, Permisos, etc.)"
 m_idx = meses_str.index(mes_rep) + 1
 a_int = int(anio_rep)
 
-dias_del_mes = [date(a_int, m_idx, d) for d in range(1, calendar.monthrange(a_int, m_idx)[1] + 1)]
+dias_del_mes = calcular_dias_del_mes(a_int, m_idx)
+festivos_del_mes = festivos_mes(a_int, m_idx)  # calculados una vez por año
+
+def etiqueta_dia(x):
+    festivo = nombre_festivo(x)
+    return x.strftime("%d/%m/%Y (%A)") + (f" · Festivo: {festivo}" if festivo else "")
 
+# Los festivos del mes vienen marcados; al cambiar de mes se recargan los del nuevo mes
 dias_novedad_global = st.multiselect(
     "Seleccione los días que NO laboró (Festivos, Permiso Sindical, Incapacidad, etc.):",
     options=dias_del_mes,
-    format_func=lambda x: x.strftime("%d/%m/%Y (%A)"),
-    help="Al seleccionar días aquí, se descontarán automáticamente de TODAS las fichas."
+    default=festivos_del_mes,
+    format_func=etiqueta_dia,
+    help="Al seleccionar días aquí, se descontarán automáticamente de TODAS las fichas. Los festivos nacionales ya vienen marcados."
 )
+if festivos_del_mes:
+    st.caption(f"🇨🇴 Festivos de {mes_rep}: " + ", ".join(f"{f:%d/%m} {nombre_festivo(f)}" for f in festivos_del_mes)
+               + ". Quítelos de la lista si laboró ese día.")
+cal_mes = calendario_mes(a_int, m_idx, dias_novedad_global)
 
 if 'filas' not in st.session_state: st.session_state.filas = []
 if 'otras_filas' not in st.session_state: st.session_state.otras_filas = []
 
+# La tabla de fichas (st.data_editor) guarda sus ediciones relativas a las
+# filas que recibió; cuando cambian las filas mismas (carga, alta, borrado) se
+# cambia su key para empezar de cero.
+if 'ver_tabla' not in st.session_state: st.session_state.ver_tabla = 0
+
+def reiniciar_tabla(seleccion=0):
+    st.session_state.ver_tabla += 1
+    st.session_state.ficha_sel = seleccion
+
+def agregar_ficha():
+    st.session_state.filas.append({"ficha":"","h_inicio":time(8,0),"h_fin":time(12,0),"dias":{d:False for d in DIAS_NOM},"competencia":INDICE_SENA.primera(),"rap":"","horas":0,"evaluado":"NO","termino":"NO"})
+    reiniciar_tabla(len(st.session_state.filas) - 1)
+
+def borrar_ficha(i):
+    st.session_state.filas.pop(i)
+    reiniciar_tabla(max(0, min(i, len(st.session_state.filas) - 1)))
+
 # --- CARGA AUTOMÁTICA BLINDADA ---
 st.divider()
 with st.expander("🚀 Cargar Horario Automáticamente desde Excel", expanded=True):
     archivo = st.file_uploader("Sube tu horario oficial", type=['xlsx', 'xls'])
     if archivo and st.button("⚙️ Procesar Horario"):
         try:
-            xls = pd.ExcelFile(archivo)
-            hoja = next((n for n in xls.sheet_names if "HORARIOINSTRUCTOR" in n.upper() or "INSTRUCTORHORARIO" in n.upper()), None)
-            if hoja:
-                df_h = pd.read_excel(xls, sheet_name=hoja, header=None)
-                hora_col, start_row, grupo_cols = -1, -1, []
-                for r in range(min(40, len(df_h))):
-                    row_vals = [str(x).strip().upper() for x in df_h.iloc[r].values]
-                    if 'HORA' in row_vals:
-                        hora_col, start_row = row_vals.index('HORA'), r + 1
-                    for c, val in enumerate(row_vals):
-                        if 'GRUPO' in val:
-                            if c not in grupo_cols: grupo_cols.append(c)
-                
-                if hora_col != -1 and grupo_cols:
-                    dias_nom = ["L", "M", "Mi", "J", "V", "S"]
-                    day_cols = {dias_nom[i]: col for i, col in enumerate(sorted(list(set(grupo_cols)))) if i < 6}
-                    bloques = []
-                    for dia, col_idx in day_cols.items():
-                        cur_f, cur_s, cur_e = None, None, None
-                        for idx in range(start_row, len(df_h)):
-                            h_raw = str(df_h.iloc[idx, hora_col])
-                            m = re.findall(r'\d{1,2}:\d{2}', h_raw)
-                            if len(m) < 2: continue
-                            f_val = str(df_h.iloc[idx, col_idx]).strip().split('.')[0]
-                            f_limpia = f_val if f_val.isdigit() and len(f_val) > 3 else None
-                            if f_limpia:
-                                if cur_f == f_limpia and cur_e == m[0]: cur_e = m[1]
-                                else:
-                                    if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
-                                    cur_f, cur_s, cur_e = f_limpia, m[0], m[1]
-                            else:
-                                if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
-                                cur_f = None
-                        if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
-
-                    agrupados = {}
-                    for b in bloques:
-                        k = (b['ficha'], b['inicio'], b['fin'])
-                        if k not in agrupados: agrupados[k] = []
-                        agrupados[k].append(b['dia'])
-                    
-                    st.session_state.filas = []
-                    for (f, i, fn), d_list in agrupados.items():
-                        st.session_state.filas.append({
-                            "ficha": f, "h_inicio": datetime.strptime(i, "%H:%M").time(), "h_fin": datetime.strptime(fn, "%H:%M").time(), 
-                            "dias": {d: (d in d_list) for d in dias_nom},
-                            "competencia": list(DB_SENA.keys())[0] if DB_SENA else "OTRA", "rap": "", "horas": 0, "evaluado": "NO", "termino": "NO"
-                        })
-                    st.success("✅ ¡Horario reconocido!")
-                    st.rerun()
+            filas_leidas = leer_horario(archivo, INDICE_SENA.primera(), cache=cache_horarios())
+            if filas_leidas is not None:
+                st.session_state.filas = filas_leidas
+                reiniciar_tabla()
+                st.success("✅ ¡Horario reconocido!")
+                st.rerun()
         except Exception as e: st.error(f"Error: {e}")
 
 # --- FORMACIÓN DIRECTA ---
-total_dir = 0
 st.subheader("📘 1. Formación Directa")
-if st.button("➕ Agregar Ficha Manual"):
-    st.session_state.filas.append({"ficha":"","h_inicio":time(8,0),"h_fin":time(12,0),"dias":{d:False for d in ["L","M","Mi","J","V","S"]},"competencia":list(DB_SENA.keys())[0],"rap":"","horas":0,"evaluado":"NO","termino":"NO"})
+st.button("➕ Agregar Ficha Manual", on_click=agregar_ficha)
+
+filas = st.session_state.filas
+heredadas = aplicar_herencia(filas)
+total_dir = calcular_horas(filas, cal_mes)
 
-f_idx_del = []
-fichas_memo = {} 
+if filas:
+    # Vista compacta: ficha, horario y días se editan en la tabla; el resto
+    # en el panel de detalle de la ficha seleccionada.
+    tabla = tabla_fichas(filas, heredadas)
+    with medicion.etapa("app.tabla"):
+        editada = st.data_editor(
+            tabla, key=f"tabla_fichas{st.session_state.ver_tabla}", num_rows="fixed", width="stretch",
+            disabled=["Horas", "Competencia", "RAP", "Evaluado", "Terminó", "Vinculada"],
+            column_config={
+                "Ficha": st.column_config.TextColumn("Ficha", width="small"),
+                "Inicio": st.column_config.TimeColumn("Inicio", format="HH:mm", step=300),
+                "Fin": st.column_config.TimeColumn("Fin", format="HH:mm", step=300),
+                **{d: st.column_config.CheckboxColumn(d, width="small") for d in DIAS_NOM},
+                "Horas": st.column_config.NumberColumn("Horas", format="%g"),
+                "Vinculada": st.column_config.CheckboxColumn("🔗", help="Hereda competencia, RAP y estado de la primera fila de la misma ficha"),
+            },
+        )
+    if aplicar_tabla(filas, tabla, editada):
+        st.rerun()
 
-for i, fila in enumerate(st.session_state.filas):
-    with st.expander(f"📌 Ficha: {fila['ficha']} | {fila['h_inicio'].strftime('%H:%M')}", expanded=True):
+    # --- PANEL DE DETALLE (solo la ficha seleccionada) ---
+    if st.session_state.get("ficha_sel", 0) >= len(filas): st.session_state.ficha_sel = len(filas) - 1
+    i = st.selectbox("✏️ Ficha a editar", range(len(filas)), key="ficha_sel",
+                     format_func=lambda k: f"#{k} · Ficha {filas[k]['ficha'] or '(sin número)'} · {filas[k]['h_inicio'].strftime('%H:%M')}-{filas[k]['h_fin'].strftime('%H:%M')}")
+    fila, ver = filas[i], st.session_state.ver_tabla
+    with st.container(border=True):
         c_dat, c_del = st.columns([0.85, 0.15])
-        if c_del.button("BORRAR", key=f"df{i}"): f_idx_del.append(i)
-        
-        c1, c2, c3, c4 = c_dat.columns([1.5, 1, 1, 1])
-        fila['ficha'] = c1.text_input("Ficha", fila['ficha'], key=f"f{i}")
-        ficha_actual = fila['ficha'].strip()
-        fila['h_inicio'], fila['h_fin'] = c2.time_input("Inicio", fila['h_inicio'], key=f"hi{i}"), c3.time_input("Fin", fila['h_fin'], key=f"hf{i}")
-        cd = st.columns(6)
-        for idx, d in enumerate(["L", "M", "Mi", "J", "V", "S"]): fila['dias'][d] = cd[idx].checkbox(d, fila['dias'][d], key=f"d{d}{i}")
-        
-        # --- CÁLCULO AUTOMÁTICO CON NOVEDADES ---
-        mapa_dias = {"L": 0, "M": 1, "Mi": 2, "J": 3, "V": 4, "S": 5}
-        dias_activos_ficha = [mapa_dias[d] for d, activo in fila['dias'].items() if activo]
-        
-        fechas_finales = [f for f in dias_del_mes if f.weekday() in dias_activos_ficha and f not in dias_novedad_global]
-        
-        h_dia = (datetime.combine(date.today(), fila['h_fin']) - datetime.combine(date.today(), fila['h_inicio'])).seconds / 3600
-        
-        fila['horas'] = len(fechas_finales) * h_dia
-        total_dir += fila['horas']
-        
+        c_dat.metric("Subtotal", f"{fila['horas']:g} hrs")
+        c_del.button("BORRAR", key=f"df{i}_{ver}", on_click=borrar_ficha, args=(i,))
         if dias_novedad_global:
-            st.caption(f"✅ Se descontaron {len([f for f in dias_del_mes if f.weekday() in dias_activos_ficha and f in dias_novedad_global])} días por novedades globales en esta ficha.")
-        
-        c4.metric("Subtotal", f"{fila['horas']:g} hrs")
-        
-        # --- INICIO LÓGICA DE HERENCIA INTELIGENTE ---
-        es_heredado = False
-        if ficha_actual != "" and ficha_actual in fichas_memo:
-            es_heredado = True
-            fila['competencia'] = fichas_memo[ficha_actual]['competencia']
-            fila['rap'] = fichas_memo[ficha_actual]['rap']
-            fila['evaluado'] = fichas_memo[ficha_actual]['evaluado']
-            fila['termino'] = fichas_memo[ficha_actual]['termino']
-            
-            st.session_state[f"cp{i}"] = fila['competencia']
-            
-            ops_memo = DB_SENA.get(fila['competencia'], [])
-            if ops_memo and fila['rap'] in ops_memo:
-                st.session_state[f"rp{i}"] = fila['rap']
-            else:
-                st.session_state[f"rpm{i}"] = fila['rap']
-            
-        # UI: Competencia
-        lista_comps = list(DB_SENA.keys())
-        idx_comp = lista_comps.index(fila['competencia']) if fila['competencia'] in lista_comps else 0
-        fila['competencia'] = st.selectbox("Competencia", lista_comps, index=idx_comp, key=f"cp{i}", disabled=es_heredado)
-        
-        # UI: RAP
-        ops = DB_SENA.get(fila['competencia'], [])
-        if ops:
-            idx_rap = ops.index(fila['rap']) if fila['rap'] in ops else 0
-            fila['rap'] = st.selectbox("RAP", ops, index=idx_rap, key=f"rp{i}", disabled=es_heredado)
+            st.caption(f"✅ Se descontaron {cal_mes.dias_descontados(fila['dias'])} días por novedades globales en esta ficha.")
+
+        if heredadas[i]:
+            st.markdown(f"**Competencia:** {fila['competencia']}  \n**RAP:** {fila['rap'] or '—'}  \n"
+                        f"**¿Está Evaluado?** {fila.get('evaluado', 'NO')} · **¿Ya Terminó?** {fila.get('termino', 'NO')}")
+            st.info("🔗 *Competencia, RAP y Estado vinculados automáticamente a la primera aparición de esta ficha. Si desea hacer cambios, edite la original.*")
         else:
-            fila['rap'] = st.text_area("RAP manual", value=fila['rap'], key=f"rpm{i}", disabled=es_heredado)
-
-        # UI: Estado
-        st.markdown("**Estado de la Competencia / RAP:**")
-        ce, ct = st.columns(2)
-        fila['evaluado'] = ce.radio("¿Está Evaluado?", ["SÍ", "NO"], index=0 if fila.get('evaluado', 'NO')=="SÍ" else 1, horizontal=True, key=f"ev{i}", disabled=es_heredado)
-        fila['termino'] = ct.radio("¿Ya Terminó?", ["SÍ", "NO"], index=0 if fila.get('termino', 'NO')=="SÍ" else 1, horizontal=True, key=f"tm{i}", disabled=es_heredado)
-
-        if es_heredado:
-            st.info("🔗 *Competencia, RAP y Estado vinculados automáticamente a la primera aparición de esta ficha. Si desea hacer cambios, edite la original de arriba.*")
-        elif ficha_actual != "":
-            fichas_memo[ficha_actual] = {
-                'competencia': fila['competencia'],
-                'rap': fila['rap'],
-                'evaluado': fila['evaluado'],
-                'termino': fila['termino']
-            }
-        # --- FIN LÓGICA DE HERENCIA ---
-
-for idx in reversed(f_idx_del): st.session_state.filas.pop(idx); st.rerun()
+            antes = tuple(fila.get(k) for k in ('competencia', 'rap', 'evaluado', 'termino'))
+            # UI: Competencia
+            fila['competencia'] = selector_buscable("Competencia", INDICE_SENA.competencias, fila['competencia'], f"cp{i}_{ver}")
+
+            # UI: RAP
+            ops = INDICE_SENA.indice_raps(fila['competencia'])
+            if len(ops):
+                fila['rap'] = selector_buscable("RAP", ops, fila['rap'], f"rp{i}_{ver}")
+            else:
+                fila['rap'] = st.text_area("RAP manual", value=fila['rap'], key=f"rpm{i}_{ver}")
+
+            # UI: Estado
+            st.markdown("**Estado de la Competencia / RAP:**")
+            ce, ct = st.columns(2)
+            fila['evaluado'] = ce.radio("¿Está Evaluado?", ["SÍ", "NO"], index=0 if fila.get('evaluado', 'NO')=="SÍ" else 1, horizontal=True, key=f"ev{i}_{ver}")
+            fila['termino'] = ct.radio("¿Ya Terminó?", ["SÍ", "NO"], index=0 if fila.get('termino', 'NO')=="SÍ" else 1, horizontal=True, key=f"tm{i}_{ver}")
+            # La tabla ya se dibujó con los valores anteriores: si algo cambió, se
+            # pasa a las filas vinculadas y se repite el rerun para mostrarlo.
+            if tuple(fila.get(k) for k in ('competencia', 'rap', 'evaluado', 'termino')) != antes:
+                aplicar_herencia(filas)
+                st.rerun()
 
 # --- OTRAS ACTIVIDADES ---
 st.divider()
@@ -424,7 +275,62 @@ total_mes = total_dir + total_otr
 if os.path.exists("logo_sena.png"):
     st.sidebar.image("logo_sena.png", width=100)
 st.sidebar.markdown(f"### 📊 RESUMEN\n**Formación Directa:** {total_dir:g} hrs\n**Otras Actividades:** {total_otr:g} hrs\n---\n**TOTAL MES:** {total_mes:g} hrs")
+est_cache = cache_horarios().estadisticas()
+st.sidebar.caption(f"🗂️ Caché de horarios: {est_cache['aciertos_memoria'] + est_cache['aciertos_disco']} aciertos · {est_cache['fallos']} fallos · {est_cache['entradas']} en memoria")
+est_render = pool_render().estadisticas()
+st.sidebar.caption(f"🖨️ Generación de reportes: {est_render['en_curso']}/{est_render['workers']} procesos ocupados · {est_render['en_cola']} en cola")
+if CATALOGO.cargando:
+    st.sidebar.caption(f"⏳ Actualizando catálogo de competencias ({len(INDICE_SENA)} disponibles).")
 
 if nombre_ins and total_mes > 0:
-    pdf_f = crear_pdf(nombre_ins, cedula_ins, mes_rep, anio_rep, st.session_state.filas, st.session_state.otras_filas, total_dir, total_otr, total_mes, dias_novedad_global)
-    st.download_button(label="📥 DESCARGAR REPORTE PDF FINAL (3D)", data=pdf_f, file_name=f"Reporte_{nombre_ins}_{mes_rep}.pdf", mime="application/pdf")
+    # Los reportes se generan en el pool de render compartido (procesos aparte,
+    # cupo acotado) sobre una copia de los datos de este rerun: el botón solo
+    # envía el pedido y, mientras haya uno pendiente, un fragmento consulta
+    # cada segundo sin rehacer la página. Misma huella -> mismo render.
+    datos_pdf = (nombre_ins, cedula_ins, mes_rep, anio_rep, copy.deepcopy(st.session_state.filas), copy.deepcopy(st.session_state.otras_filas), total_dir, total_otr, total_mes, list(dias_novedad_global))
+    clave_pdf = huella_reporte(*datos_pdf)
+    render = pool_render()
+    descargas = {
+        "pdf": ("📥 DESCARGAR REPORTE PDF FINAL (3D)", "application/pdf"),
+        "xlsx": ("📊 DESCARGAR EN EXCEL", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    }
+
+    def pedir_reporte(formato):
+        medicion.contar(f"app.pedidos_{formato}")
+        historico().archivar(*datos_pdf)
+        st.session_state.envio_render = render.enviar(f"{clave_pdf}.{formato}", formato, datos_pdf)
+
+    estados = {formato: render.estado(f"{clave_pdf}.{formato}") for formato in descargas}
+    for col, (formato, (etiqueta, mime)) in zip(st.columns(len(descargas)), descargas.items()):
+        estado, valor = estados[formato]
+        if estado == "listo":
+            col.download_button(label=etiqueta, data=valor, file_name=f"Reporte_{nombre_ins}_{mes_rep}.{formato}", mime=mime, key=f"dl_{formato}")
+        elif estado == "nuevo" or estado == "error":
+            if estado == "error":
+                col.error(f"No se pudo generar el {formato.upper()}: {valor}")
+            col.button(f"⚙️ GENERAR {formato.upper()}", key=f"gen_{formato}", on_click=pedir_reporte, args=(formato,))
+    if st.session_state.pop("envio_render", None) == "lleno":
+        st.warning("El servidor está generando muchos reportes a la vez; intente de nuevo en unos segundos.")
+
+    if any(e in ("generando", "en_cola") for e, _ in estados.values()):
+        @st.fragment(run_every=1)
+        def esperar_render():
+            actuales = [render.estado(f"{clave_pdf}.{formato}") for formato in descargas]
+            if not any(e in ("generando", "en_cola") for e, _ in actuales):
+                st.rerun()  # listo: la página completa muestra las descargas
+            posicion = max(v for e, v in actuales if e in ("generando", "en_cola"))
+            st.info(f"⏳ Generando su reporte… {posicion} reporte(s) antes que el suyo en la cola." if posicion
+                    else "⏳ Generando su reporte…")
+        esperar_render()
+
+# --- PANEL DE DEPURACIÓN ---
+medidor = medicion.terminar_corrida()
+if os.environ.get("REPORTE_DEBUG") == "1" or st.query_params.get("debug") == "1":
+    columnas_t = {"total_ms": st.column_config.NumberColumn("ms", format="%.1f"), "max_ms": st.column_config.NumberColumn("máx ms", format="%.1f")}
+    with st.sidebar.expander("🛠️ Tiempos por etapa", expanded=True):
+        st.caption(f"Último rerun: {medidor.como_dict()['total_ms']:.0f} ms")
+        st.dataframe(medidor.resumen(), hide_index=True, column_config=columnas_t)
+        st.caption("Acumulado del proceso (incluye el catálogo y el PDF/Excel de los procesos de render, que corren fuera del rerun):")
+        st.dataframe(medicion.TOTAL.resumen(), hide_index=True, column_config=columnas_t)
+        if medicion.TOTAL.contadores:
+            st.caption(" · ".join(f"{k}: {v}" for k, v in sorted(medicion.TOTAL.contadores.items())))
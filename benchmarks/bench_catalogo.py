@@ -0,0 +1,71 @@
+"""Benchmark: selectores de competencia/RAP con lista completa vs. índice.
+
+    python -m benchmarks.bench_catalogo [competencias] [fichas]
+
+Por cada ficha la versión anterior armaba list(DB_SENA.keys()), buscaba la
+posición con list.index y enviaba todas las opciones al navegador. Con el
+índice se consulta la posición en un dict y solo viajan las coincidencias.
+"""
+import sys
+import time
+
+from nucleo.catalogo import IndiceCatalogo, normalizar
+
+
+def catalogo_sintetico(n_competencias, raps=12):
+    return {f"Competencia {i} - Gestión {'eléctrica' if i % 2 else 'administrativa'} nivel {i % 9}":
+            [f"RAP {j} de la competencia {i}" for j in range(raps)] for i in range(n_competencias)}
+
+
+def selector_lista(base_datos, comp, rap):
+    lista_comps = list(base_datos.keys())
+    idx_comp = lista_comps.index(comp) if comp in lista_comps else 0
+    ops = base_datos.get(comp, [])
+    idx_rap = ops.index(rap) if rap in ops else 0
+    return idx_comp, idx_rap, sum(map(len, lista_comps)) + sum(map(len, ops))
+
+
+def selector_indice(indice, comp, rap, consulta, limite=30):
+    opciones = indice.buscar_competencias(consulta, limite)
+    if comp in indice.competencias and comp not in opciones:
+        opciones.insert(0, comp)
+    raps = indice.indice_raps(comp)
+    ops = raps.buscar("", limite)
+    return indice.competencias.pos.get(comp, 0), raps.pos.get(rap, 0), sum(map(len, opciones)) + sum(map(len, ops))
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    n_comp = int(argv[0]) if argv else 2000
+    n_fichas = int(argv[1]) if len(argv) > 1 else 40
+
+    base_datos = catalogo_sintetico(n_comp)
+    nombres = list(base_datos)
+    fichas = [(nombres[-1 - k * 7], f"RAP {k % 12} de la competencia {n_comp - 1 - k * 7}") for k in range(n_fichas)]
+
+    t0 = time.perf_counter()
+    indice = IndiceCatalogo(base_datos)
+    t_indice = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    carga_lista = sum(selector_lista(base_datos, c, r)[2] for c, r in fichas)
+    t_lista = time.perf_counter() - t0
+
+    consultas = [(c, r, " ".join(normalizar(c).split()[:2])) for c, r in fichas]
+    for c, r, q in consultas:  # primer rerun: arma los índices de RAP usados
+        selector_indice(indice, c, r, q)
+    t0 = time.perf_counter()
+    carga_indice = sum(selector_indice(indice, c, r, q)[2] for c, r, q in consultas)
+    t_idx = time.perf_counter() - t0
+
+    for c, r in fichas:
+        a, b = selector_lista(base_datos, c, r)[:2], selector_indice(indice, c, r, "")[:2]
+        assert a == b, (c, a, b)
+
+    print(f"{n_comp} competencias, {n_fichas} fichas (índice armado en {t_indice * 1e3:.1f} ms)")
+    print(f"lista completa  {t_lista * 1e3:8.2f} ms por rerun   {carga_lista / 1e6:6.2f} MB de opciones")
+    print(f"índice          {t_idx * 1e3:8.2f} ms por rerun   {carga_indice / 1e6:6.2f} MB de opciones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: pico de memoria del PDF consolidado según el número de instructores.
+
+    python -m benchmarks.bench_consolidado [instructores ...] [--fichas N]
+
+Cada tamaño (por defecto 50, 200 y 500 instructores) corre en un proceso
+aparte para que el pico de RSS (ru_maxrss) sea solo suyo. "streaming" es
+generar_consolidado con los reportes como generador y salida a archivo;
+"en_memoria" arma primero todos los reportes y todos los flowables en una
+lista y escribe a un BytesIO (lo que haría un build ingenuo).
+"""
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+MODOS = ("streaming", "en_memoria")
+
+
+def rss_mb():
+    # Linux: KB; macOS: bytes
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def reportes_sinteticos(n_instructores, n_fichas):
+    from benchmarks.sintetico import filas_reporte
+    from nucleo.horas import calcular_horas, calendario_mes
+
+    cal = calendario_mes(2026, 3)
+    for k in range(n_instructores):
+        filas = filas_reporte(n_fichas, semilla=k)
+        tot = calcular_horas(filas, cal)
+        yield (f"Instructor {k}", str(10_000_000 + k), "Marzo", "2026", filas, [], tot, 0, tot, [])
+
+
+def hijo(n_instructores, n_fichas, modo):
+    """Corre un tamaño y un modo; imprime "segundos rss_base rss_pico paginas bytes"."""
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    from nucleo.consolidado import FlujoSecciones, generar_consolidado, secciones
+    from nucleo.pdf import obtener_plantilla
+
+    obtener_plantilla()
+    next(reportes_sinteticos(1, 1))  # imports de numpy/horas fuera de la medición
+    base = rss_mb()
+    t0 = time.perf_counter()
+    if modo == "streaming":
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "consolidado.pdf")
+            res = generar_consolidado(reportes_sinteticos(n_instructores, n_fichas), ruta)
+            tamano = os.path.getsize(ruta)
+    else:
+        reportes = list(reportes_sinteticos(n_instructores, n_fichas))
+        resumen = []
+        elementos = [e for s in secciones(obtener_plantilla(), reportes, resumen, "RESUMEN DEL CENTRO") for e in s]
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
+        doc.build(FlujoSecciones([elementos]))
+        res, tamano = {"paginas": doc.page}, len(buffer.getvalue())
+    print(f"{time.perf_counter() - t0:.3f} {base:.1f} {rss_mb():.1f} {res['paginas']} {tamano}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("instructores", nargs="*", type=int, default=[50, 200, 500])
+    parser.add_argument("--fichas", type=int, default=25, help="Filas de Formación Directa por instructor")
+    parser.add_argument("--hijo", nargs=2, metavar=("N", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.hijo:
+        hijo(int(args.hijo[0]), args.fichas, args.hijo[1])
+        return
+
+    print(f"{'instructores':>12} {'modo':>11} {'s':>7} {'páginas':>8} {'PDF MB':>7} {'RSS base':>9} {'RSS pico':>9} {'Δ MB':>7}")
+    for n in args.instructores:
+        for modo in MODOS:
+            salida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_consolidado", "--fichas", str(args.fichas), "--hijo", str(n), modo],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            seg, base, pico, paginas, tamano = float(salida[0]), float(salida[1]), float(salida[2]), int(salida[3]), int(salida[4])
+            print(f"{n:>12} {modo:>11} {seg:7.2f} {paginas:>8} {tamano / 1e6:7.1f} {base:9.1f} {pico:9.1f} {pico - base:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
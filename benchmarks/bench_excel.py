@@ -0,0 +1,80 @@
+"""Benchmark: exportación a Excel (write-only) frente al PDF.
+
+    python -m benchmarks.bench_excel [--fichas N] [--reportes N] [--instructores N ...]
+
+1. Un reporte: reportes por segundo de crear_xlsx y de crear_pdf con los
+   mismos datos.
+2. Todo el centro: libro con una hoja por instructor (generar_libro_centro)
+   frente al PDF consolidado (generar_consolidado), cada uno en un proceso
+   aparte para medir su pico de RSS, como en bench_consolidado.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_consolidado import reportes_sinteticos, rss_mb
+
+
+def por_segundo(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+def hijo(n_instructores, n_fichas, modo):
+    """Imprime "segundos rss_base rss_pico bytes" de un tamaño y un formato."""
+    from nucleo.consolidado import generar_consolidado
+    from nucleo.excel import generar_libro_centro
+    from nucleo.pdf import obtener_plantilla
+
+    obtener_plantilla()
+    next(reportes_sinteticos(1, 1))
+    base = rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, f"centro.{modo}")
+        generar = generar_libro_centro if modo == "xlsx" else generar_consolidado
+        t0 = time.perf_counter()
+        generar(reportes_sinteticos(n_instructores, n_fichas), ruta)
+        seg = time.perf_counter() - t0
+        tamano = os.path.getsize(ruta)
+    print(f"{seg:.3f} {base:.1f} {rss_mb():.1f} {tamano}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fichas", type=int, default=25, help="Filas de Formación Directa por instructor")
+    parser.add_argument("--reportes", type=int, default=30, help="Repeticiones del reporte individual")
+    parser.add_argument("--instructores", nargs="*", type=int, default=[50, 500])
+    parser.add_argument("--hijo", nargs=2, metavar=("N", "MODO"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.hijo:
+        hijo(int(args.hijo[0]), args.fichas, args.hijo[1])
+        return
+
+    from nucleo.excel import crear_xlsx
+    from nucleo.pdf import crear_pdf
+
+    datos = next(reportes_sinteticos(1, args.fichas))
+    crear_pdf(*datos), crear_xlsx(*datos)  # calentamiento (plantilla, estilos)
+    pdf = por_segundo(lambda: crear_pdf(*datos), args.reportes)
+    xlsx = por_segundo(lambda: crear_xlsx(*datos), args.reportes)
+    print(f"Un reporte de {args.fichas} fichas: PDF {pdf:6.1f} rep/s | Excel {xlsx:6.1f} rep/s | x{xlsx / pdf:.1f}")
+
+    print(f"\n{'instructores':>12} {'formato':>8} {'s':>7} {'filas/s':>9} {'MB':>6} {'Δ RSS MB':>9}")
+    for n in args.instructores:
+        for modo in ("pdf", "xlsx"):
+            salida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_excel", "--fichas", str(args.fichas), "--hijo", str(n), modo],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            seg, base, pico, tamano = float(salida[0]), float(salida[1]), float(salida[2]), int(salida[3])
+            print(f"{n:>12} {modo:>8} {seg:7.2f} {n * args.fichas / seg:9.0f} {tamano / 1e6:6.1f} {pico - base:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
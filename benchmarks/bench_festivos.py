@@ -0,0 +1,59 @@
+"""Benchmark de los festivos y del cálculo de horas de un año.
+
+    python -m benchmarks.bench_festivos [instructores] [fichas_por_instructor]
+
+Compara un reporte anual de todo el centro: festivos por año en caché + una
+matriz de horas por mes, frente a recalcular festivos y recorrer el mes
+ficha por ficha. La paridad (Pascua contra dateutil, calendarios oficiales
+2024-2026, traslados al lunes) está en benchmarks/test_festivos.py (pytest).
+"""
+import sys
+import time
+from datetime import date
+
+from benchmarks.bench_horas import horas_recorrido
+from benchmarks.sintetico import filas_reporte
+from nucleo.festivos import festivos_anio
+from nucleo.horas import calendarios_rango, dias_del_mes, horas_por_mes
+
+def anual_recorrido(lote, anio):
+    """Festivos recalculados y mes recorrido día a día para cada ficha."""
+    total = 0.0
+    for filas in lote:
+        for fila in filas:
+            for mes in range(1, 13):
+                festivos = [f for f, _ in festivos_anio.__wrapped__(anio) if f.month == mes]
+                total += horas_recorrido(fila, dias_del_mes(anio, mes), festivos)[0]
+    return total
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    instructores = int(argv[0]) if argv else 100
+    fichas = int(argv[1]) if len(argv) > 1 else 25
+
+    anio = 2027  # año que nada dejó en caché antes de medir
+    lote = [filas_reporte(fichas, semilla=k) for k in range(instructores)]
+    todas = [f for filas in lote for f in filas]
+
+    t0 = time.perf_counter()
+    esperado = anual_recorrido(lote, anio)
+    t_recorrido = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matriz = horas_por_mes(todas, calendarios_rango(date(anio, 1, 1), date(anio, 12, 31)))
+    t_motor = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    horas_por_mes(todas, calendarios_rango(date(anio, 1, 1), date(anio, 12, 31)))
+    t_caliente = time.perf_counter() - t0
+
+    assert abs(matriz.sum() - esperado) < 1e-6 * max(1.0, esperado)
+    print(f"Año {anio}: {len(todas)} fichas ({instructores} instructores x {fichas}) x 12 meses, {matriz.sum():g} horas")
+    print(f"festivos + recorrido por ficha {t_recorrido * 1000:9.1f} ms")
+    print(f"caché anual + matriz NumPy     {t_motor * 1000:9.1f} ms  x{t_recorrido / t_motor:.0f}")
+    print(f"  (calendarios ya en caché)    {t_caliente * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: consultas del histórico con años de reportes de todo el centro.
+
+    python -m benchmarks.bench_historico [instructores] [meses] [fichas_por_reporte]
+
+Llena un histórico temporal (por defecto 300 instructores x 36 meses x 25
+filas, unas 270 mil fichas) y mide cada consulta agregada sin filtro, por
+periodo, por instructor y por ficha. El objetivo es < 1 s por consulta.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.sintetico import filas_reporte
+from nucleo.historico import HistoricoReportes, periodo
+from nucleo.horas import MESES, calcular_horas, calendario_mes
+
+
+def reportes_sinteticos(n_instructores, n_meses, n_fichas, anio_inicial=2024):
+    rnd = random.Random(0)
+    for m in range(n_meses):
+        anio, mes = anio_inicial + m // 12, m % 12 + 1
+        cal = calendario_mes(anio, mes)
+        for k in range(n_instructores):
+            filas = filas_reporte(n_fichas, semilla=k * 1000 + m)
+            for f in filas:
+                f['ficha'] = str(2600000 + (int(f['ficha']) - 2600000 + k * 3) % 2000)
+                f['competencia'] = f"COMPETENCIA {rnd.randrange(150)}"
+            tot = calcular_horas(filas, cal)
+            otras = [{"actividad": "Preparación de clases", "f_desde": f"{anio}-{mes:02d}-01",
+                      "f_hasta": f"{anio}-{mes:02d}-02", "dias": 2.0, "horas": 17.0}]
+            yield (f"Instructor {k}", str(10_000_000 + k), MESES[mes - 1], str(anio), filas, otras,
+                   tot, 17.0, tot + 17.0, [])
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    n_inst = int(argv[0]) if argv else 300
+    n_meses = int(argv[1]) if len(argv) > 1 else 36
+    n_fichas = int(argv[2]) if len(argv) > 2 else 25
+
+    with tempfile.TemporaryDirectory() as tmp:
+        historico = HistoricoReportes(os.path.join(tmp, "historico.sqlite"))
+        t0 = time.perf_counter()
+        lote = []
+        for datos in reportes_sinteticos(n_inst, n_meses, n_fichas):
+            lote.append(datos)
+            if len(lote) == 1000:
+                historico.guardar_varios(lote)
+                lote = []
+        historico.guardar_varios(lote)
+        print(f"{n_inst * n_meses} reportes, {n_inst * n_meses * n_fichas} fichas cargados en "
+              f"{time.perf_counter() - t0:.1f} s ({os.path.getsize(historico.ruta) / 1e6:.0f} MB)")
+
+        t0 = time.perf_counter()
+        historico.guardar(*next(reportes_sinteticos(1, 1, n_fichas)))
+        print(f"guardar un reporte (reemplazo): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        filtros = {
+            "todo": {},
+            "un mes": {"desde": periodo(2025, 6), "hasta": periodo(2025, 6)},
+            "un año": {"desde": periodo(2025, 1), "hasta": periodo(2025, 12)},
+            "instructor": {"cedula": "10000042"},
+            "ficha": {"ficha": "2600123"},
+        }
+        consultas = ["horas_por_mes", "horas_por_instructor", "horas_por_ficha", "horas_por_competencia", "estado_raps"]
+        print(f"{'':22s}" + "".join(f"{f:>12s}" for f in filtros))
+        peor = 0.0
+        for nombre in consultas:
+            celdas = []
+            for filtro in filtros.values():
+                t0 = time.perf_counter()
+                getattr(historico, nombre)(**filtro)
+                ms = (time.perf_counter() - t0) * 1000
+                peor = max(peor, ms)
+                celdas.append(f"{ms:9.1f} ms")
+            print(f"{nombre:22s}" + "".join(celdas))
+        print(f"Consulta más lenta: {peor:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: lector vectorizado vs. el bucle celda a celda original.
+
+    python -m benchmarks.bench_horario [filas ...]
+
+Antes de medir comprueba que ambos motores devuelven los mismos bloques; la
+paridad sobre hojas pequeñas con casos de borde está en
+benchmarks/test_horario.py (pytest).
+"""
+import re
+import sys
+import time
+
+from benchmarks.sintetico import hoja_horario
+from nucleo.horario import DIAS_NOM, agrupar_bloques, extraer_bloques
+
+
+def extraer_bloques_bucle(df_h):
+    """Implementación original del manejador "Procesar Horario" de app1.py."""
+    hora_col, start_row, grupo_cols = -1, -1, []
+    for r in range(min(40, len(df_h))):
+        row_vals = [str(x).strip().upper() for x in df_h.iloc[r].values]
+        if 'HORA' in row_vals:
+            hora_col, start_row = row_vals.index('HORA'), r + 1
+        for c, val in enumerate(row_vals):
+            if 'GRUPO' in val:
+                if c not in grupo_cols: grupo_cols.append(c)
+    if hora_col == -1 or not grupo_cols:
+        return None
+    day_cols = {DIAS_NOM[i]: col for i, col in enumerate(sorted(list(set(grupo_cols)))) if i < 6}
+    bloques = []
+    for dia, col_idx in day_cols.items():
+        cur_f, cur_s, cur_e = None, None, None
+        for idx in range(start_row, len(df_h)):
+            h_raw = str(df_h.iloc[idx, hora_col])
+            m = re.findall(r'\d{1,2}:\d{2}', h_raw)
+            if len(m) < 2: continue
+            f_val = str(df_h.iloc[idx, col_idx]).strip().split('.')[0]
+            f_limpia = f_val if f_val.isdigit() and len(f_val) > 3 else None
+            if f_limpia:
+                if cur_f == f_limpia and cur_e == m[0]: cur_e = m[1]
+                else:
+                    if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
+                    cur_f, cur_s, cur_e = f_limpia, m[0], m[1]
+            else:
+                if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
+                cur_f = None
+        if cur_f: bloques.append({'ficha': cur_f, 'dia': dia, 'inicio': cur_s, 'fin': cur_e})
+    return bloques
+
+
+def medir(fn, *args, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(*args)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main(argv=None):
+    tamanos = [int(a) for a in (argv or sys.argv[1:])] or [100, 1000, 10000]
+    for n in tamanos:
+        df_h = hoja_horario(n, n_fichas=max(8, n // 50))
+        esperado = extraer_bloques_bucle(df_h)
+        obtenido = extraer_bloques(df_h)
+        assert obtenido == esperado, f"bloques distintos con {n} filas"
+        assert agrupar_bloques(obtenido) == agrupar_bloques(esperado)
+
+        t_bucle = medir(extraer_bloques_bucle, df_h, repeticiones=1 if n >= 10000 else 3)
+        t_vect = medir(extraer_bloques, df_h)
+        print(f"{n:>6} filas | {len(esperado):>5} bloques | bucle {t_bucle * 1000:9.1f} ms | "
+              f"vectorizado {t_vect * 1000:7.1f} ms | x{t_bucle / t_vect:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark del motor de horas frente al recorrido día a día.
+
+    python -m benchmarks.bench_horas [instructores] [fichas_por_instructor]
+
+Mide el cálculo que hacía app1.py ficha por ficha, el motor por ficha y el
+cálculo por lotes con NumPy, y verifica que los tres coinciden. La paridad
+sobre meses y novedades aleatorias está en benchmarks/test_horas.py (pytest).
+"""
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+
+from benchmarks.sintetico import filas_reporte
+from nucleo.horas import calendario_mes, dias_del_mes, horas_lote, matriz_filas
+
+
+def horas_recorrido(fila, dias_mes, novedades):
+    """Cálculo original de app1.py (recorre las fechas del mes por ficha)."""
+    mapa_dias = {"L": 0, "M": 1, "Mi": 2, "J": 3, "V": 4, "S": 5}
+    dias_activos_ficha = [mapa_dias[d] for d, activo in fila['dias'].items() if activo]
+    fechas_finales = [f for f in dias_mes if f.weekday() in dias_activos_ficha and f not in novedades]
+    h_dia = (datetime.combine(date.today(), fila['h_fin']) - datetime.combine(date.today(), fila['h_inicio'])).seconds / 3600
+    descontados = len([f for f in dias_mes if f.weekday() in dias_activos_ficha and f in novedades])
+    return len(fechas_finales) * h_dia, descontados
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    instructores = int(argv[0]) if argv else 200
+    fichas = int(argv[1]) if len(argv) > 1 else 40
+
+    anio, mes = 2026, 3
+    dias_mes = dias_del_mes(anio, mes)
+    novedades = [date(2026, 3, 23), date(2026, 3, 24)]
+    lote = [filas_reporte(fichas, semilla=k) for k in range(instructores)]
+    n = instructores * fichas
+
+    t0 = time.perf_counter()
+    esperado = [horas_recorrido(f, dias_mes, novedades)[0] for filas in lote for f in filas]
+    t_recorrido = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cal = calendario_mes(anio, mes, novedades)
+    por_fila = [cal.horas_fila(f) for filas in lote for f in filas]
+    t_motor = time.perf_counter() - t0
+
+    todas = [f for filas in lote for f in filas]
+    t0 = time.perf_counter()
+    dias, h_dia = matriz_filas(todas)
+    netos = np.broadcast_to(cal.netos, (n, 7))  # un calendario por fila, como en un lote real
+    en_lote = horas_lote(dias, h_dia, netos).tolist()
+    t_lote = time.perf_counter() - t0
+
+    assert por_fila == esperado == en_lote
+    print(f"{n} fichas ({instructores} instructores x {fichas})")
+    print(f"recorrido día a día {t_recorrido * 1000:8.1f} ms")
+    print(f"motor por ficha     {t_motor * 1000:8.1f} ms  x{t_recorrido / t_motor:.0f}")
+    print(f"motor NumPy lote    {t_lote * 1000:8.1f} ms  x{t_recorrido / t_lote:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark y control de regresión del tiempo de importación (arranque en frío).
+
+    python -m benchmarks.bench_importtime [--presupuesto-ms N] [--repeticiones N]
+
+Lanza `python -X importtime -c "import ..."` en procesos nuevos con los
+módulos que app1.py importa al arrancar (leídos de su código) y comprueba que
+no arrastren reportlab ni openpyxl: esos se cargan solo al pedir un PDF o un
+Excel o al leer un horario. Sale con código 1 si aparece un módulo prohibido o si se
+supera el presupuesto de milisegundos.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROHIBIDOS = ("reportlab", "openpyxl")
+
+
+def modulos_de_arranque(ruta_app=os.path.join(RAIZ, "app1.py")):
+    """Módulos importados a nivel de módulo por la app (no los diferidos)."""
+    with open(ruta_app, encoding="utf-8") as fh:
+        arbol = ast.parse(fh.read())
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            modulos.extend(a.name for a in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module:
+            modulos.append(nodo.module)
+    return list(dict.fromkeys(modulos))
+
+
+def importtime(modulos, repeticiones=3):
+    """(ms acumulados de la mejor corrida, nombres de todos los módulos cargados)."""
+    mejor, cargados = float('inf'), set()
+    for _ in range(repeticiones):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modulos)],
+                              cwd=RAIZ, capture_output=True, text=True, check=True)
+        total, nombres = 0, set()
+        for linea in proc.stderr.splitlines():
+            if not linea.startswith("import time:") or "cumulative" in linea:
+                continue
+            _, acumulado, nombre = linea[len("import time:"):].split("|")
+            nombres.add(nombre.strip())
+            if not nombre.startswith("  "):  # solo los de primer nivel
+                total += int(acumulado)
+        if total / 1000 < mejor:
+            mejor, cargados = total / 1000, nombres
+    return mejor, cargados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--presupuesto-ms", type=float, help="falla si el arranque de la app lo supera")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    arranque = modulos_de_arranque()
+    propios = [m for m in arranque if m.split(".")[0] == "nucleo"]
+    ok = True
+    for etiqueta, modulos in [("app1.py (arranque)", arranque), ("núcleo usado por la app", propios),
+                              ("nucleo.pdf (al pedir el PDF)", ["nucleo.pdf"]),
+                              ("nucleo.excel (al pedir el Excel)", ["nucleo.excel"]),
+                              ("nucleo.horario + openpyxl (al leer)", ["nucleo.horario", "openpyxl"])]:
+        ms, cargados = importtime(modulos, args.repeticiones)
+        pesados = sorted({m.split(".")[0] for m in cargados} & set(PROHIBIDOS))
+        print(f"{etiqueta:38s} {ms:8.1f} ms   {', '.join(pesados) or '-'}")
+        if modulos is arranque or modulos is propios:
+            if pesados:
+                print(f"  REGRESIÓN: {', '.join(pesados)} se importa al arrancar")
+                ok = False
+            if modulos is arranque and args.presupuesto_ms and ms > args.presupuesto_ms:
+                print(f"  REGRESIÓN: {ms:.1f} ms supera el presupuesto de {args.presupuesto_ms:g} ms")
+                ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
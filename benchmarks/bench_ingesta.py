@@ -0,0 +1,56 @@
+"""Benchmark: pd.ExcelFile (hoja completa) vs. openpyxl read_only en streaming.
+
+    python -m benchmarks.bench_ingesta [filas_por_hoja] [hojas_extra] [columnas_extra]
+
+Mide tiempo y pico de memoria (tracemalloc, en una corrida aparte para no
+sesgar el tiempo) de cada ruta sobre un libro sintético con la hoja
+HORARIOINSTRUCTOR, hojas de relleno y columnas de observaciones. La paridad
+de ambas rutas con casos de borde está en benchmarks/test_ingesta.py (pytest).
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.sintetico import libro_horario
+from nucleo.horario import leer_horario_excelfile, leer_horario_streaming
+
+
+def medir(fn, ruta, repeticiones=3):
+    seg = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        filas = fn(ruta)
+        seg = min(seg, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(ruta)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return filas, seg, pico
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    n_filas = int(argv[0]) if argv else 5000
+    hojas_extra = int(argv[1]) if len(argv) > 1 else 6
+    columnas_extra = int(argv[2]) if len(argv) > 2 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = libro_horario(os.path.join(tmp, "horario.xlsx"), n_filas,
+                             hojas_extra=hojas_extra, columnas_extra=columnas_extra)
+        print(f"Libro: {os.path.getsize(ruta) / 1e6:.1f} MB, {hojas_extra + 1} hojas de {n_filas} filas "
+              f"x {8 + columnas_extra} columnas")
+
+        leer_horario_excelfile(ruta), leer_horario_streaming(ruta)  # calentamiento
+        filas_a, t_a, m_a = medir(leer_horario_excelfile, ruta)
+        filas_b, t_b, m_b = medir(leer_horario_streaming, ruta)
+        assert filas_a == filas_b, "las dos rutas devuelven filas distintas"
+
+        print(f"pd.ExcelFile     {t_a:7.2f} s   pico {m_a / 1e6:8.1f} MB")
+        print(f"openpyxl stream  {t_b:7.2f} s   pico {m_b / 1e6:8.1f} MB")
+        print(f"x{t_a / t_b:.1f} más rápido, x{m_a / m_b:.1f} menos memoria")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Microbenchmark: reportes PDF por segundo con y sin plantilla compartida.
+
+    python -m benchmarks.bench_pdf [n_fichas] [n_reportes]
+
+"sin plantilla" arma estilos, logo y estilos de tabla en cada reporte (lo
+que hacía crear_pdf antes); "plantilla compartida" los reutiliza.
+"""
+import sys
+import time
+
+from benchmarks.sintetico import filas_reporte
+from nucleo.pdf import PlantillaReporte
+
+
+def por_segundo(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    n_fichas = int(argv[0]) if argv else 10
+    n_reportes = int(argv[1]) if len(argv) > 1 else 50
+    filas = filas_reporte(n_fichas)
+    for f in filas:
+        f['horas'] = 16
+    total = 16 * n_fichas
+    datos = ("Instructor de prueba", "123", "Marzo", "2026", filas, [], total, 0, total, [])
+
+    t0 = time.perf_counter()
+    plantilla = PlantillaReporte()
+    plantilla.crear_pdf(*datos)
+    print(f"primer reporte (armado de plantilla incluido): {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    sin = por_segundo(lambda: PlantillaReporte().crear_pdf(*datos), n_reportes)
+    con = por_segundo(lambda: plantilla.crear_pdf(*datos), n_reportes)
+    print(f"{n_fichas} fichas | sin plantilla {sin:6.1f} rep/s | plantilla compartida {con:6.1f} rep/s | x{con / sin:.1f}")
+
+
+if __name__ == "__main__":
+    main()
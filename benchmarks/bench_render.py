@@ -0,0 +1,195 @@
+"""Prueba de carga: N sesiones pidiendo su reporte a la vez (cierre de mes).
+
+    python -m benchmarks.bench_render [--sesiones 24] [--workers N] [--fichas 30]
+                                      [--duplicados 0.25] [--modos sincrono,pool]
+
+Cada sesión es un hilo de este proceso, como las sesiones del servidor de
+Streamlit: pide su PDF y espera a tenerlo. Una fracción de sesiones
+(--duplicados) pide exactamente los mismos datos que otra.
+
+- sincrono: cada sesión llama crear_pdf en su propio hilo (como antes).
+- pool: la sesión envía el pedido a PoolRender y consulta estado() cada
+  100 ms, como el fragmento de la app.
+
+Mientras tanto una sonda repite el trabajo de un rerun liviano (calcular
+horas y armar la tabla de 40 fichas) y mide cuánto tarda: es lo que nota un
+usuario que edita su reporte mientras los demás descargan.
+
+Antes de medir se verifica que ningún proceso del pool ejecute el script
+principal del padre (bajo Streamlit, app1.py).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import types
+
+from benchmarks.sintetico import filas_reporte
+from nucleo.cache import huella_reporte
+from nucleo.fichas import aplicar_herencia, tabla_fichas
+from nucleo.horas import calcular_horas, calendario_mes
+from nucleo.render import PoolRender
+
+
+def datos_sesiones(n, n_fichas, duplicados):
+    """Argumentos de crear_pdf por sesión; las últimas `duplicados` repiten a las primeras."""
+    cal = calendario_mes(2026, 3)
+    unicos = max(1, n - int(n * duplicados))
+    base = []
+    for k in range(unicos):
+        filas = filas_reporte(n_fichas, semilla=k)
+        tot = calcular_horas(filas, cal)
+        base.append((f"Instructor {k}", str(10_000_000 + k), "Marzo", "2026", filas, [], tot, 0, tot, []))
+    return [base[k % unicos] for k in range(n)]
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))] if valores else 0.0
+
+
+class Sonda(threading.Thread):
+    """Rerun liviano en bucle; guarda la duración de cada uno."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.filas = filas_reporte(40, semilla=99)
+        self.cal = calendario_mes(2026, 3)
+        self.tiempos = []
+        self.parar = threading.Event()
+
+    def run(self):
+        while not self.parar.is_set():
+            t0 = time.perf_counter()
+            calcular_horas(self.filas, self.cal)
+            tabla_fichas(self.filas, aplicar_herencia(self.filas))
+            self.tiempos.append(time.perf_counter() - t0)
+            time.sleep(0.02)
+
+
+def sesion_sincrona(datos, latencias, i, arranque):
+    from nucleo.pdf import crear_pdf
+
+    arranque.wait()
+    t0 = time.perf_counter()
+    crear_pdf(*datos)
+    latencias[i] = time.perf_counter() - t0
+
+
+def sesion_pool(pool, datos, latencias, i, arranque):
+    clave = huella_reporte(*datos) + ".pdf"
+    arranque.wait()
+    t0 = time.perf_counter()
+    pool.enviar(clave, "pdf", datos)
+    while pool.estado(clave)[0] != "listo":
+        time.sleep(0.1)
+    latencias[i] = time.perf_counter() - t0
+
+
+def comprobar_sin_app(sesiones, workers):
+    """Falla si algún proceso del pool vuelve a ejecutar el __main__ del padre.
+
+    Simula Streamlit: el __main__ es un script (como app1.py) que deja una
+    marca si se ejecuta; se generan más reportes que procesos para usarlos todos.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        marca = os.path.join(tmp, "ejecutado")
+        script = os.path.join(tmp, "app_falsa.py")
+        with open(script, "w") as fh:
+            fh.write(f"with open({marca!r}, 'a') as fh:\n    fh.write('x')\n")
+        principal = sys.modules["__main__"]
+        falso = types.ModuleType("__main__")
+        falso.__file__, falso.__spec__ = script, None
+        sys.modules["__main__"] = falso
+        try:
+            pool = PoolRender(workers=workers, max_cola=len(sesiones))
+            claves = [f"{k}.pdf" for k in range(max(len(sesiones), 3 * pool.workers))]
+            for k, clave in enumerate(claves):
+                pool.enviar(clave, "pdf", sesiones[k % len(sesiones)])
+            for clave in claves:
+                pool.esperar(clave)
+            n = pool.workers
+            pool.cerrar()
+        finally:
+            sys.modules["__main__"] = principal
+        assert not os.path.exists(marca), "un proceso del pool ejecutó el script principal"
+    print(f"pool: {n} procesos, ninguno ejecutó el script principal")
+
+
+def correr(modo, sesiones, workers):
+    latencias = [0.0] * len(sesiones)
+    pool = PoolRender(workers=workers, max_cola=len(sesiones)) if modo == "pool" else None
+    if pool:
+        pool.enviar("calentamiento", "pdf", sesiones[0])
+        pool.esperar("calentamiento")  # procesos arrancados antes de medir
+    sonda = Sonda()
+    sonda.start()
+    time.sleep(0.3)
+    base = list(sonda.tiempos)
+
+    arranque = threading.Event()
+    if pool:
+        hilos = [threading.Thread(target=sesion_pool, args=(pool, d, latencias, i, arranque)) for i, d in enumerate(sesiones)]
+    else:
+        hilos = [threading.Thread(target=sesion_sincrona, args=(d, latencias, i, arranque)) for i, d in enumerate(sesiones)]
+    profundidad = 0
+    for h in hilos:
+        h.start()
+    t0 = time.perf_counter()
+    arranque.set()  # todas las sesiones piden a la vez
+    while any(h.is_alive() for h in hilos):
+        if pool:
+            profundidad = max(profundidad, pool.estadisticas()["en_cola"])
+        time.sleep(0.02)
+    total = time.perf_counter() - t0
+    sonda.parar.set()
+    sonda.join()
+    carga = sonda.tiempos[len(base):]
+    res = {
+        "total_s": total,
+        "lat_p50": percentil(latencias, 50), "lat_p95": percentil(latencias, 95),
+        "sonda_base_ms": statistics.median(base) * 1000 if base else 0.0,
+        "sonda_p50_ms": percentil(carga, 50) * 1000, "sonda_p95_ms": percentil(carga, 95) * 1000,
+        "sonda_max_ms": max(carga, default=0.0) * 1000,
+        "renders": len(sesiones), "cola_max": profundidad,
+    }
+    if pool:
+        est = pool.estadisticas()
+        res["renders"] = est["enviados"] - 1  # sin el calentamiento
+        res["coalescidos"] = est["coalescidos"]
+        pool.cerrar()
+    return res
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesiones", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto REPORTE_RENDER_WORKERS)")
+    parser.add_argument("--fichas", type=int, default=30)
+    parser.add_argument("--duplicados", type=float, default=0.25, help="Fracción de sesiones con datos repetidos")
+    parser.add_argument("--modos", default="sincrono,pool")
+    args = parser.parse_args(argv)
+
+    sesiones = datos_sesiones(args.sesiones, args.fichas, args.duplicados)
+    from nucleo.pdf import crear_pdf
+    crear_pdf(*sesiones[0])  # plantilla y reportlab cargados en ambos modos
+
+    if "pool" in args.modos.split(","):
+        comprobar_sin_app(sesiones, args.workers)
+    print(f"{args.sesiones} sesiones, {args.fichas} fichas, {args.duplicados:.0%} con datos repetidos")
+    print(f"{'modo':>9} {'total s':>8} {'renders':>8} {'lat p50':>8} {'lat p95':>8} "
+          f"{'rerun base':>11} {'rerun p50':>10} {'rerun p95':>10} {'rerun máx':>10} {'cola máx':>9}")
+    for modo in args.modos.split(","):
+        r = correr(modo, sesiones, args.workers)
+        print(f"{modo:>9} {r['total_s']:8.2f} {r['renders']:>8} {r['lat_p50']:8.2f} {r['lat_p95']:8.2f} "
+              f"{r['sonda_base_ms']:9.1f}ms {r['sonda_p50_ms']:8.1f}ms {r['sonda_p95_ms']:8.1f}ms "
+              f"{r['sonda_max_ms']:8.1f}ms {r['cola_max']:>9}")
+        if "coalescidos" in r:
+            print(f"{'':>9} {r['coalescidos']} pedidos repetidos atendidos con un render ya en curso")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark: latencia de un rerun de la app con N fichas cargadas.
+
+    python -m benchmarks.bench_rerun [n_fichas] [ruta_app ...]
+
+Usa el AppTest de Streamlit (sin navegador). Por defecto mide app1.py; se
+pueden pasar otras versiones del script para comparar (p. ej. una copia de
+un commit anterior). También mide crear_pdf con los mismos datos, que es lo
+que costaba cada rerun cuando el PDF se generaba siempre.
+"""
+import copy
+import logging
+import os
+import sys
+import time
+from datetime import date
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.sintetico import filas_reporte
+from nucleo.horas import calcular_horas, calendario_mes
+from nucleo.pdf import crear_pdf
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_app(ruta, filas, reruns=10):
+    at = AppTest.from_file(ruta, default_timeout=120)
+    at.session_state["filas"] = copy.deepcopy(filas)
+    at.run()
+    at.text_input[0].set_value("Instructor de prueba")
+    at.run()
+    assert not at.exception, at.exception
+    tiempos = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        tiempos.append(time.perf_counter() - t0)
+    return sorted(tiempos)[len(tiempos) // 2]
+
+
+def medir_pdf(filas, repeticiones=5):
+    hoy = date.today()
+    filas = copy.deepcopy(filas)
+    total = calcular_horas(filas, calendario_mes(hoy.year, hoy.month))
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        crear_pdf("Instructor de prueba", "123", "Marzo", "2026", filas, [], total, 0, total, [])
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main(argv=None):
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    argv = argv if argv is not None else sys.argv[1:]
+    n = int(argv[0]) if argv else 30
+    rutas = argv[1:] or [os.path.join(RAIZ, "app1.py")]
+    filas = filas_reporte(n)
+    for ruta in rutas:
+        print(f"{ruta}: rerun con {n} fichas {medir_app(os.path.abspath(ruta), filas) * 1000:.0f} ms (mediana)")
+    print(f"crear_pdf con {n} fichas: {medir_pdf(filas) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Generadores de datos sintéticos para los benchmarks (sin red)."""
+import random
+
+import pandas as pd
+
+COLUMNAS_DIA = 6
+
+
+def hoja_horario(n_filas, n_fichas=8, semilla=0, filas_encabezado=3, columnas_extra=0):
+    """DataFrame crudo (header=None) con el formato de HORARIOINSTRUCTOR.
+
+    Cada fila es una franja de una hora; las fichas ocupan tramos de 1 a 4
+    franjas seguidas y hay huecos y filas sin hora para ejercitar los cortes.
+    columnas_extra añade columnas de observaciones a la derecha, como en los
+    exportes institucionales.
+    """
+    rnd = random.Random(semilla)
+    fichas = [str(2600000 + rnd.randrange(99999)) for _ in range(n_fichas)]
+    filas = [["SERVICIO NACIONAL DE APRENDIZAJE"] + [""] * (COLUMNAS_DIA + 1) for _ in range(filas_encabezado - 1)]
+    filas.append(["HORA"] + ["GRUPO"] * COLUMNAS_DIA + ["OBSERVACIONES"])
+
+    dias = [[] for _ in range(COLUMNAS_DIA)]
+    for d in range(COLUMNAS_DIA):
+        while len(dias[d]) < n_filas:
+            valor = rnd.choice(fichas + [None, None])
+            dias[d].extend([float(valor) if valor else None] * rnd.randint(1, 4))
+
+    for i in range(n_filas):
+        if i % 17 == 16:
+            filas.append(["RECESO"] + [""] * (COLUMNAS_DIA + 1))
+            continue
+        h = 6 + i % 16
+        filas.append([f"{h:02d}:00 - {h + 1:02d}:00"] + [dias[d][i] for d in range(COLUMNAS_DIA)] + [""])
+    if columnas_extra:
+        relleno = [f"Ambiente {k} - sede principal" for k in range(columnas_extra)]
+        filas = [f + relleno for f in filas]
+    return pd.DataFrame(filas)
+
+
+# Variantes de hoja_variante para las pruebas de paridad de los lectores
+VARIANTES_HOJA = ["base", "fila_vacia", "columna_vacia", "fichas_enteras", "fichas_texto"]
+
+
+def hoja_variante(variante, n_filas=120, semilla=0):
+    """hoja_horario con una fila o columna vacía al comienzo, o fichas int / texto "2612345.0"."""
+    df = hoja_horario(n_filas, n_fichas=6, semilla=semilla)
+    if variante == "fila_vacia":
+        df = pd.concat([pd.DataFrame([[None] * df.shape[1]]), df], ignore_index=True)
+    elif variante == "columna_vacia":
+        df = pd.concat([pd.DataFrame({"vacia": [None] * len(df)}), df], axis=1)
+        df.columns = range(df.shape[1])
+    elif variante == "fichas_enteras":
+        df = df.map(lambda v: int(v) if isinstance(v, float) and v == v else v)
+    elif variante == "fichas_texto":
+        df = df.map(lambda v: f"{v:.1f}" if isinstance(v, float) and v == v else v)
+    return df
+
+
+def libro_horario(ruta, n_filas, n_fichas=8, semilla=0, hojas_extra=0, columnas_extra=0):
+    """Escribe un .xlsx con la hoja HORARIOINSTRUCTOR (y hojas de relleno)."""
+    with pd.ExcelWriter(ruta) as w:
+        for k in range(hojas_extra):
+            hoja_horario(n_filas, n_fichas, semilla + k + 1, columnas_extra=columnas_extra).to_excel(w, sheet_name=f"OTRA{k}", header=False, index=False)
+        hoja_horario(n_filas, n_fichas, semilla, columnas_extra=columnas_extra).to_excel(w, sheet_name="HORARIOINSTRUCTOR", header=False, index=False)
+    return ruta
+
+
+def filas_reporte(n_fichas, semilla=0):
+    """Filas de Formación Directa como las deja la interfaz (st.session_state.filas)."""
+    from datetime import time as hora
+    rnd = random.Random(semilla)
+    filas = []
+    for i in range(n_fichas):
+        h = 6 + (i * 2) % 14
+        dias = {d: rnd.random() < 0.4 for d in ["L", "M", "Mi", "J", "V", "S"]}
+        filas.append({
+            "ficha": str(2600000 + i // 2), "h_inicio": hora(h, 0), "h_fin": hora(h + 2, 0), "dias": dias,
+            "competencia": f"COMPETENCIA SINTÉTICA {i % 7}", "rap": f"RAP {i % 5} de la competencia {i % 7}",
+            "horas": 0, "evaluado": rnd.choice(["SÍ", "NO"]), "termino": "NO",
+        })
+    return filas
@@ -0,0 +1,176 @@
+"""Suite reproducible de benchmarks con salida JSON (sin red).
+
+    python -m benchmarks.suite [--salida resultados.json] [--comparar anterior.json]
+                               [--tolerancia 1.5] [--rapido]
+
+Cargas sintéticas: horarios de 10/100/1000 bloques (DataFrame y .xlsx),
+catálogos de 100 a 5000 RAP (parseo, índice, búsqueda, SQLite), cálculo de
+horas (un mes y un año con festivos) y PDF (uno con su desglose por etapa
+y un lote en el pool de procesos).
+Con --comparar sale con código 1 si algún caso es más lento que
+`tolerancia` veces el resultado anterior.
+
+Con pytest (sin argumentos, desde la raíz del repo) corre en modo rápido
+vía benchmarks/test_suite.py.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from benchmarks.sintetico import filas_reporte, hoja_horario, libro_horario
+from nucleo import medicion
+from nucleo.catalogo import CatalogoLocal, IndiceCatalogo, parsear_csv
+from nucleo.horario import agrupar_bloques, filas_desde_agrupados, leer_horario, tabla_bloques
+from nucleo.horas import calcular_horas, calendario_mes, calendarios_rango, horas_por_mes
+
+def medir(fn, repeticiones):
+    fn()  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return {"mejor_ms": min(tiempos), "mediana_ms": statistics.median(tiempos), "repeticiones": repeticiones}
+
+
+def filas_para_bloques(objetivo):
+    """Filas de hoja_horario necesarias para llegar a `objetivo` bloques."""
+    n = max(2, objetivo // 2)
+    while len(tabla_bloques(hoja_horario(n))) < objetivo:
+        n += max(1, n // 20)
+    return n
+
+
+def csv_catalogo(n_raps, raps_por_competencia=10):
+    lineas = ["COMPETENCIA,RAP"]
+    for i in range(n_raps):
+        c = i // raps_por_competencia
+        lineas.append(f"\"Competencia {c} - Gestión {'eléctrica' if c % 2 else 'administrativa'}\","
+                      f"\"RAP {i % raps_por_competencia}: aplicar técnicas de nivel {i % 7}\"")
+    return "\n".join(lineas).encode()
+
+
+# ==========================================
+# CARGAS
+# ==========================================
+def casos_horario(reps, tmp):
+    for bloques in (10, 100, 1000):
+        n_filas = filas_para_bloques(bloques)
+        hoja = hoja_horario(n_filas)
+        n = len(tabla_bloques(hoja))
+        yield "horario", f"parseo_{bloques}", {"bloques": n}, medir(
+            lambda: filas_desde_agrupados(agrupar_bloques(tabla_bloques(hoja))), reps)
+        ruta = libro_horario(os.path.join(tmp, f"horario_{bloques}.xlsx"), n_filas)
+        yield "horario", f"xlsx_{bloques}", {"bloques": n}, medir(lambda: leer_horario(ruta), reps)
+
+
+def casos_catalogo(reps, tmp):
+    for n_raps in (100, 1000, 5000):
+        contenido = csv_catalogo(n_raps)
+        base_datos = parsear_csv(contenido)
+        indice = IndiceCatalogo(base_datos)
+        consultas = ["gestion elec", "competencia 4", "adm", "zzz"]
+        local = CatalogoLocal(os.path.join(tmp, f"catalogo_{n_raps}.sqlite"))
+        param = {"raps": n_raps, "competencias": len(base_datos)}
+        yield "catalogo", f"parseo_{n_raps}", param, medir(lambda: parsear_csv(contenido), reps)
+        yield "catalogo", f"indice_{n_raps}", param, medir(lambda: IndiceCatalogo(base_datos), reps)
+        yield "catalogo", f"busqueda_{n_raps}", param, medir(
+            lambda: [indice.buscar_competencias(q, 30) for q in consultas], reps)
+        yield "catalogo", f"sqlite_{n_raps}", param, medir(
+            lambda: (local.guardar(base_datos, "suite", None, "x"), local.leer()), reps)
+
+
+def casos_horas(reps, tmp):
+    cal = calendario_mes(2026, 3)
+    for n in (40, 1000):
+        filas = filas_reporte(n)
+        yield "horas", f"calculo_{n}", {"fichas": n}, medir(lambda: calcular_horas(filas, cal), reps)
+    filas = filas_reporte(1000)
+    yield "horas", "anual_1000", {"fichas": 1000, "meses": 12}, medir(
+        lambda: horas_por_mes(filas, calendarios_rango(date(2026, 1, 1), date(2026, 12, 31))), reps)
+
+
+def casos_pdf(reps, tmp, n_lote=20):
+    from nucleo.lote import generar_lote
+    from nucleo.pdf import crear_pdf
+
+    filas = filas_reporte(30)
+    total = calcular_horas(filas, calendario_mes(2026, 3))
+    args = ("Instructor de prueba", "123", "Marzo", "2026", filas, [], total, 0, total, [])
+    with medicion.corrida("suite.pdf") as m:
+        res = medir(lambda: crear_pdf(*args), reps)
+    res["etapas"] = {e["etapa"]: e["total_ms"] / e["llamadas"] for e in m.resumen()}
+    yield "pdf", "reporte_30_fichas", {"fichas": 30}, res
+
+    horarios = [(f"inst{i}", filas_reporte(30, semilla=i)) for i in range(n_lote)]
+    salida = os.path.join(tmp, "lote.zip")
+    res = medir(lambda: generar_lote(horarios, "Marzo", "2026", salida=salida, workers=2), max(1, reps // 3))
+    res["reportes_por_segundo"] = n_lote / (res["mejor_ms"] / 1000)
+    yield "pdf", f"lote_{n_lote}", {"reportes": n_lote, "workers": 2}, res
+
+
+# ==========================================
+# EJECUCIÓN Y COMPARACIÓN
+# ==========================================
+def ejecutar(rapido=False):
+    reps = 3 if rapido else 7
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for grupo in (casos_horario, casos_catalogo, casos_horas, casos_pdf):
+            for nombre_grupo, caso, param, res in grupo(reps, tmp):
+                resultados.append({"grupo": nombre_grupo, "caso": caso, "parametros": param, **res})
+                print(f"{nombre_grupo:9s} {caso:22s} {res['mejor_ms']:10.2f} ms (mediana {res['mediana_ms']:.2f})")
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, anterior, tolerancia):
+    """Imprime la razón actual/anterior por caso; devuelve los que empeoraron."""
+    previos = {(r["grupo"], r["caso"]): r for r in anterior["resultados"]}
+    peores = []
+    for r in actual["resultados"]:
+        previo = previos.get((r["grupo"], r["caso"]))
+        if not previo or not previo["mejor_ms"]:
+            continue
+        razon = r["mejor_ms"] / previo["mejor_ms"]
+        marca = "  <-- REGRESIÓN" if razon > tolerancia else ""
+        print(f"{r['grupo']:9s} {r['caso']:22s} x{razon:5.2f}{marca}")
+        if marca:
+            peores.append(r)
+    return peores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--salida", default="resultados_benchmark.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=1.5)
+    parser.add_argument("--rapido", action="store_true", help="menos repeticiones")
+    args = parser.parse_args(argv)
+
+    actual = ejecutar(args.rapido)
+    with open(args.salida, "w", encoding="utf-8") as fh:
+        json.dump(actual, fh, indent=2, ensure_ascii=False)
+    print(f"Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            anterior = json.load(fh)
+        if comparar(actual, anterior, args.tolerancia):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
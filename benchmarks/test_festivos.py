@@ -0,0 +1,38 @@
+"""Paridad de los festivos de Colombia (pytest).
+
+    pytest benchmarks/test_festivos.py
+
+Pascua contra dateutil (1900-2200), fechas únicas y ordenadas, festivos
+trasladables siempre en lunes y los calendarios oficiales 2024-2026.
+"""
+import pytest
+from dateutil.easter import easter
+
+from nucleo.festivos import PASCUA, TRASLADABLES, domingo_de_pascua, festivos_anio
+
+# Calendarios publicados (día/mes)
+OFICIALES = {
+    2024: "01/01 08/01 25/03 28/03 29/03 01/05 13/05 03/06 10/06 01/07 20/07 07/08 19/08 14/10 04/11 11/11 08/12 25/12",
+    2025: "01/01 06/01 24/03 17/04 18/04 01/05 02/06 23/06 30/06 20/07 07/08 18/08 13/10 03/11 17/11 08/12 25/12",
+    2026: "01/01 12/01 23/03 02/04 03/04 01/05 18/05 08/06 15/06 29/06 20/07 07/08 17/08 12/10 02/11 16/11 08/12 25/12",
+}
+TRASLADADOS = {nombre for _, _, nombre in TRASLADABLES} | {nombre for _, t, nombre in PASCUA if t}
+
+
+def test_pascua_igual_a_dateutil():
+    for anio in range(1900, 2201):
+        assert domingo_de_pascua(anio) == easter(anio), anio
+
+
+def test_fechas_unicas_y_traslados_en_lunes():
+    for anio in range(1900, 2201):
+        fechas = [f for f, _ in festivos_anio(anio)]
+        assert len(fechas) == len(set(fechas)) and fechas == sorted(fechas), anio
+        for fecha, nombres in festivos_anio(anio):
+            if set(nombres.split(" / ")) & TRASLADADOS:
+                assert fecha.weekday() == 0, (fecha, nombres)
+
+
+@pytest.mark.parametrize("anio", sorted(OFICIALES))
+def test_calendario_oficial(anio):
+    assert [f.strftime("%d/%m") for f, _ in festivos_anio(anio)] == OFICIALES[anio].split()
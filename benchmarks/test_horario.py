@@ -0,0 +1,24 @@
+"""Paridad del lector vectorizado con el bucle celda a celda original (pytest).
+
+    pytest benchmarks/test_horario.py
+
+Hojas sintéticas pequeñas (también con una fila o una columna vacía al
+comienzo y fichas como número entero, decimal o texto "2612345.0"):
+extraer_bloques da los mismos bloques que extraer_bloques_bucle.
+"""
+import pytest
+
+from benchmarks.bench_horario import extraer_bloques_bucle
+from benchmarks.sintetico import VARIANTES_HOJA, hoja_variante
+from nucleo.horario import agrupar_bloques, extraer_bloques
+
+
+@pytest.mark.parametrize("variante", VARIANTES_HOJA)
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_vectorizado_igual_a_bucle(variante, semilla):
+    df = hoja_variante(variante, semilla=semilla)
+    esperado = extraer_bloques_bucle(df)
+    obtenido = extraer_bloques(df)
+    assert esperado
+    assert obtenido == esperado
+    assert agrupar_bloques(obtenido) == agrupar_bloques(esperado)
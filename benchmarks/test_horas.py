@@ -0,0 +1,36 @@
+"""Paridad del motor de horas con el recorrido día a día (pytest).
+
+    pytest benchmarks/test_horas.py
+
+3000 meses, fichas y novedades aleatorias (incluye novedades fuera del mes,
+que no deben descontar): CalendarioMes y el cálculo por lotes con NumPy dan
+exactamente las mismas horas y días descontados que horas_recorrido.
+"""
+import random
+from datetime import time as hora, timedelta
+
+from benchmarks.bench_horas import horas_recorrido
+from nucleo.horas import CalendarioMes, dias_del_mes, horas_lote, matriz_filas
+
+
+def casos_aleatorios(casos=3000, semilla=0):
+    rnd = random.Random(semilla)
+    for _ in range(casos):
+        anio, mes = rnd.randint(2020, 2030), rnd.randint(1, 12)
+        inicio_mes = dias_del_mes(anio, mes)[0]
+        novedades = [inicio_mes + timedelta(days=rnd.randint(-10, 40)) for _ in range(rnd.randint(0, 8))]
+        fila = {
+            "dias": {d: rnd.random() < 0.5 for d in ["L", "M", "Mi", "J", "V", "S"]},
+            "h_inicio": hora(rnd.randint(0, 23), rnd.choice([0, 15, 30, 45])),
+            "h_fin": hora(rnd.randint(0, 23), rnd.choice([0, 15, 30, 45])),
+        }
+        yield anio, mes, novedades, fila
+
+
+def test_paridad_con_recorrido():
+    for anio, mes, novedades, fila in casos_aleatorios():
+        esperado = horas_recorrido(fila, dias_del_mes(anio, mes), novedades)
+        cal = CalendarioMes(anio, mes, novedades)
+        assert (cal.horas_fila(fila), cal.dias_descontados(fila['dias'])) == esperado, (anio, mes, fila, novedades)
+        dias, h_dia = matriz_filas([fila])
+        assert horas_lote(dias, h_dia, cal.netos)[0] == esperado[0], (anio, mes, fila, novedades)
@@ -0,0 +1,24 @@
+"""Paridad de la lectura en streaming con la ruta de pd.ExcelFile (pytest).
+
+    pytest benchmarks/test_ingesta.py
+
+Libro con una hoja de relleno y HORARIOINSTRUCTOR en cada variante de
+hoja_variante: leer_horario_streaming (openpyxl read_only) devuelve las
+mismas filas que leer_horario_excelfile.
+"""
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import VARIANTES_HOJA, hoja_variante
+from nucleo.horario import leer_horario_excelfile, leer_horario_streaming
+
+
+@pytest.mark.parametrize("variante", VARIANTES_HOJA)
+def test_streaming_igual_a_excelfile(variante, tmp_path):
+    ruta = tmp_path / "horario.xlsx"
+    with pd.ExcelWriter(ruta) as w:
+        hoja_variante("base", semilla=5).to_excel(w, sheet_name="OTRA", header=False, index=False)
+        hoja_variante(variante).to_excel(w, sheet_name="HORARIOINSTRUCTOR", header=False, index=False)
+    esperado = leer_horario_excelfile(str(ruta))
+    assert esperado
+    assert leer_horario_streaming(str(ruta)) == esperado
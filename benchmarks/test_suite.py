@@ -0,0 +1,30 @@
+"""Suite de benchmarks como prueba de pytest (sin red).
+
+    pytest benchmarks/test_suite.py
+
+Corre ejecutar(rapido=True) y escribe el JSON en el tmp_path de pytest, o
+en REPORTE_BENCHMARK_JSON si está definida. Si REPORTE_BENCHMARK_ANTERIOR
+apunta a una corrida anterior, falla cuando algún caso es más lento que
+REPORTE_BENCHMARK_TOLERANCIA veces (1.5) el resultado anterior.
+"""
+import json
+import os
+
+from benchmarks.suite import comparar, ejecutar
+
+
+def test_suite(tmp_path):
+    actual = ejecutar(rapido=True)
+    salida = os.environ.get("REPORTE_BENCHMARK_JSON") or tmp_path / "resultados_benchmark.json"
+    with open(salida, "w", encoding="utf-8") as fh:
+        json.dump(actual, fh, indent=2, ensure_ascii=False)
+
+    grupos = {r["grupo"] for r in actual["resultados"]}
+    assert grupos == {"horario", "catalogo", "horas", "pdf"}
+    assert all(r["mejor_ms"] > 0 for r in actual["resultados"])
+
+    anterior = os.environ.get("REPORTE_BENCHMARK_ANTERIOR")
+    if anterior:
+        with open(anterior, encoding="utf-8") as fh:
+            peores = comparar(actual, json.load(fh), float(os.environ.get("REPORTE_BENCHMARK_TOLERANCIA", 1.5)))
+        assert not peores, [f"{r['grupo']}/{r['caso']}" for r in peores]
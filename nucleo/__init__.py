@@ -0,0 +1,10 @@
+"""Núcleo del Reporte Estadístico SENA CIEA.
+
+Lógica reutilizable sin dependencia de Streamlit: lectura del horario
+oficial, cálculo de horas con festivos, catálogo, generación del PDF
+(individual y consolidado) y del Excel, pool de render compartido,
+histórico de reportes y modo por lotes.
+Las dependencias pesadas se importan al usarse: reportlab solo con
+nucleo.pdf y openpyxl solo al leer un horario o con nucleo.excel (ver
+benchmarks/bench_importtime.py).
+"""
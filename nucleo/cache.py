@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# ==========================================
+# CACHÉ POR HUELLA DE CONTENIDO
+# ==========================================
+# LRU en memoria con tope de entradas y, opcionalmente, una carpeta en disco.
+# Se usa para los horarios leídos (clave: hash del archivo + versión del
+# lector, así las re-subidas y los lotes no vuelven a decodificar el Excel)
+# y para los PDF ya generados (clave: huella de los datos del reporte).
+
+
+def huella(contenido, *extra):
+    """SHA-256 del contenido más los datos extra (versión, hoja...)."""
+    h = hashlib.sha256(contenido)
+    for e in extra:
+        h.update(b"\0" + str(e).encode())
+    return h.hexdigest()
+
+
+def huella_reporte(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+    """Huella de todo lo que imprime crear_pdf; mismos datos -> misma huella.
+
+    Vive aquí y no en nucleo.pdf para calcularla en cada rerun sin cargar reportlab.
+    """
+    return huella(repr((nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen,
+                        list(novedades_globales))).encode())
+
+
+def leer_bytes(archivo):
+    """Bytes de una ruta, un UploadedFile de Streamlit o un objeto tipo archivo."""
+    if isinstance(archivo, (str, os.PathLike)):
+        with open(archivo, 'rb') as fh:
+            return fh.read()
+    if hasattr(archivo, 'getvalue'):
+        return archivo.getvalue()
+    archivo.seek(0)
+    return archivo.read()
+
+
+class CacheLRU:
+    """LRU thread-safe con persistencia opcional en disco (pickle por clave)."""
+
+    def __init__(self, max_entradas=64, directorio=None):
+        self.max_entradas = max_entradas
+        self.directorio = directorio
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def obtener(self, clave):
+        """Devuelve el valor guardado o None."""
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos_memoria += 1
+                return self._datos[clave]
+        if self.directorio and os.path.exists(self._ruta(clave)):
+            try:
+                with open(self._ruta(clave), 'rb') as fh:
+                    valor = pickle.load(fh)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                valor = None
+            if valor is not None:
+                with self._lock:
+                    self.aciertos_disco += 1
+                    self._guardar_memoria(clave, valor)
+                return valor
+        with self._lock:
+            self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._guardar_memoria(clave, valor)
+        if self.directorio:
+            tmp = self._ruta(clave) + f".{os.getpid()}.tmp"
+            with open(tmp, 'wb') as fh:
+                pickle.dump(valor, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._ruta(clave))
+
+    def _guardar_memoria(self, clave, valor):
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.max_entradas:
+            self._datos.popitem(last=False)
+
+    def obtener_o_calcular(self, clave, calcular):
+        """Valor cacheado o calcular() (que se guarda si no es None)."""
+        valor = self.obtener(clave)
+        if valor is None:
+            valor = calcular()
+            if valor is not None:
+                self.guardar(clave, valor)
+        return valor
+
+    def estadisticas(self):
+        return {
+            "aciertos_memoria": self.aciertos_memoria,
+            "aciertos_disco": self.aciertos_disco,
+            "fallos": self.fallos,
+            "entradas": len(self._datos),
+        }
@@ -0,0 +1,356 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import urllib.error
+import urllib.request
+from bisect import bisect_left
+from contextlib import contextmanager
+from io import BytesIO
+from itertools import islice
+
+import pandas as pd
+
+from nucleo.medicion import etapa, medido
+
+# ==========================================
+# CATÁLOGO DE COMPETENCIAS / RAP
+# ==========================================
+# El catálogo se guarda en un SQLite local. Al arrancar se usa la última copia
+# buena (sirve sin red); solo si está vencida se consulta la fuente, con ETag
+# y hash del contenido para no reprocesar cuando no cambió. La fuente es
+# intercambiable: Google Sheets en producción, un CSV local en pruebas.
+OTRA = "OTRA (Escribir manualmente)"
+SHEET_ID = "1MAIAGFEBerD3Gg-WYfOMvTXQ0uj7JO8UZBag0e8sxjw"
+RUTA_DB = os.environ.get(
+    "REPORTE_CATALOGO_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "catalogo.sqlite"),
+)
+
+log = logging.getLogger(__name__)
+
+
+class FuenteGoogleSheets:
+    """Exportación CSV de la hoja pública de competencias."""
+
+    def __init__(self, sheet_id=SHEET_ID, timeout=10):
+        self.id = f"gsheets:{sheet_id}"
+        self.url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+        self.timeout = timeout
+
+    def descargar(self, etag=None):
+        """Devuelve (contenido, etag); contenido None si no cambió (304)."""
+        req = urllib.request.Request(self.url)
+        if etag:
+            req.add_header("If-None-Match", etag)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.read(), resp.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, etag
+            raise
+
+
+class FuenteArchivo:
+    """CSV local; sirve para pruebas, benchmarks o sedes sin acceso a la hoja."""
+
+    def __init__(self, ruta):
+        self.id = f"archivo:{os.path.abspath(ruta)}"
+        self.ruta = ruta
+
+    def descargar(self, etag=None):
+        st = os.stat(self.ruta)
+        actual = f"{st.st_mtime_ns}-{st.st_size}"
+        if etag == actual:
+            return None, etag
+        with open(self.ruta, 'rb') as fh:
+            return fh.read(), actual
+
+
+def _validos(s):
+    bajo = s.str.lower()
+    return (s != "") & (bajo != "nan") & ~bajo.str.contains("unnamed", regex=False)
+
+
+@medido("catalogo.parseo")
+def parsear_csv(contenido):
+    """CSV (competencia, rap) -> {competencia: [raps]} en el orden de la hoja."""
+    df = pd.read_csv(BytesIO(contenido)).fillna("")
+    comp = df.iloc[:, 0].astype(str).str.strip()
+    rap = df.iloc[:, 1].astype(str).str.strip() if df.shape[1] > 1 else pd.Series("", index=df.index)
+
+    ok = _validos(comp)
+    comp, rap = comp[ok], rap[ok]
+    con_rap = _validos(rap)
+    base_datos = {c: [] for c in comp.unique()}
+    base_datos.update(rap[con_rap].groupby(comp[con_rap], sort=False).agg(list).to_dict())
+    base_datos[OTRA] = []
+    return base_datos
+
+
+# ==========================================
+# ALMACÉN LOCAL (SQLite)
+# ==========================================
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT);
+CREATE TABLE IF NOT EXISTS catalogo (
+    pos INTEGER PRIMARY KEY,
+    competencia TEXT NOT NULL,
+    rap TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_catalogo_competencia ON catalogo (competencia);
+"""
+
+
+class CatalogoLocal:
+    """Copia local del catálogo con su ETag, hash y hora de la última revisión."""
+
+    def __init__(self, ruta=RUTA_DB):
+        self.ruta = ruta
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with self._conectar() as con:
+            con.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conectar(self):
+        con = sqlite3.connect(self.ruta, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def meta(self):
+        with self._conectar() as con:
+            return dict(con.execute("SELECT clave, valor FROM meta"))
+
+    def _poner_meta(self, con, **valores):
+        con.executemany("INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)",
+                        [(k, None if v is None else str(v)) for k, v in valores.items()])
+
+    @medido("catalogo.leer_local")
+    def leer(self):
+        """{competencia: [raps]} de la copia local, o None si está vacía."""
+        with self._conectar() as con:
+            filas = con.execute("SELECT competencia, rap FROM catalogo ORDER BY pos").fetchall()
+        if not filas:
+            return None
+        base_datos = {}
+        for comp, rap in filas:
+            lista = base_datos.setdefault(comp, [])
+            if rap is not None:
+                lista.append(rap)
+        return base_datos
+
+    def guardar(self, base_datos, fuente_id, etag, hash_contenido):
+        filas = []
+        for comp, raps in base_datos.items():
+            if raps:
+                filas.extend((comp, r) for r in raps)
+            else:
+                filas.append((comp, None))
+        with self._conectar() as con:
+            con.execute("DELETE FROM catalogo")
+            con.executemany("INSERT INTO catalogo (pos, competencia, rap) VALUES (?, ?, ?)",
+                            [(i, c, r) for i, (c, r) in enumerate(filas)])
+            self._poner_meta(con, fuente=fuente_id, etag=etag, hash=hash_contenido, revisado=time.time())
+
+    def marcar_revisado(self, etag):
+        with self._conectar() as con:
+            self._poner_meta(con, etag=etag, revisado=time.time())
+
+    def refrescar(self, fuente, max_edad=600, forzar=False):
+        """Consulta la fuente si la copia está vencida. Devuelve True si cambió."""
+        meta = self.meta()
+        misma_fuente = meta.get("fuente") == fuente.id
+        edad = time.time() - float(meta.get("revisado") or 0)
+        if misma_fuente and edad < max_edad and not forzar:
+            return False
+
+        contenido, etag = fuente.descargar(meta.get("etag") if misma_fuente else None)
+        if contenido is None:
+            self.marcar_revisado(etag)
+            return False
+        hash_contenido = hashlib.sha256(contenido).hexdigest()
+        if misma_fuente and hash_contenido == meta.get("hash"):
+            self.marcar_revisado(etag)
+            return False
+        self.guardar(parsear_csv(contenido), fuente.id, etag, hash_contenido)
+        return True
+
+
+@medido("catalogo.carga")
+def cargar_catalogo(fuente=None, ruta=RUTA_DB, max_edad=600):
+    """Catálogo listo para la interfaz; sin red usa la última copia buena."""
+    fuente = fuente or FuenteGoogleSheets()
+    try:
+        local = CatalogoLocal(ruta)
+    except (sqlite3.Error, OSError) as e:
+        log.warning("No se pudo abrir el catálogo local %s: %s", ruta, e)
+        local = None
+    if local is not None:
+        try:
+            local.refrescar(fuente, max_edad)
+        except Exception as e:
+            log.warning("No se pudo refrescar el catálogo desde %s: %s", fuente.id, e)
+        base_datos = local.leer()
+        if base_datos:
+            return base_datos
+    else:
+        try:
+            contenido, _ = fuente.descargar()
+            return parsear_csv(contenido)
+        except Exception as e:
+            log.warning("No se pudo descargar el catálogo desde %s: %s", fuente.id, e)
+    return {OTRA: []}
+
+
+# ==========================================
+# ÍNDICE DE BÚSQUEDA
+# ==========================================
+# Se arma una vez por versión del catálogo: posiciones por nombre (sin
+# list.index) y tokens normalizados ordenados para buscar por prefijo con
+# bisect, sin tildes ni mayúsculas ("gestion inf" encuentra "Gestión de la
+# INFORMACIÓN"). La interfaz solo envía al navegador las coincidencias.
+def normalizar(texto):
+    sin_tildes = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", sin_tildes.lower()))
+
+
+class IndiceTextos:
+    """Lista de textos con posición O(1) y búsqueda por prefijos de palabra."""
+
+    def __init__(self, textos):
+        self.textos = list(textos)
+        self.pos = {}
+        for i, t in enumerate(self.textos):
+            self.pos.setdefault(t, i)
+        self._palabras = [tuple(set(normalizar(t).split())) for t in self.textos]
+        pares = sorted((tok, i) for i, palabras in enumerate(self._palabras) for tok in palabras)
+        self._tokens = [tok for tok, _ in pares]
+        self._ids = [i for _, i in pares]
+
+    def __len__(self):
+        return len(self.textos)
+
+    def __contains__(self, texto):
+        return texto in self.pos
+
+    def _rango(self, prefijo):
+        return bisect_left(self._tokens, prefijo), bisect_left(self._tokens, prefijo + "\x7f")
+
+    def buscar(self, consulta, limite=None):
+        """Textos cuyas palabras empiezan por cada palabra de la consulta."""
+        tokens = set(normalizar(consulta).split())
+        if not tokens:
+            return self.textos[:limite]
+        # Se parte del prefijo más selectivo y el resto se verifica por texto,
+        # cortando en cuanto hay `limite` coincidencias.
+        rangos = sorted((self._rango(t) + (t,) for t in tokens), key=lambda r: r[1] - r[0])
+        a, b, mas_selectivo = rangos[0]
+        resto = [t for t in tokens if t != mas_selectivo]
+        ids = (i for i in sorted(set(self._ids[a:b]))
+               if all(any(p.startswith(t) for p in self._palabras[i]) for t in resto))
+        return [self.textos[i] for i in islice(ids, limite)]
+
+
+class IndiceCatalogo:
+    """Catálogo {competencia: [raps]} con índices de competencias y de RAP."""
+
+    def __init__(self, base_datos):
+        self.base_datos = base_datos
+        self.competencias = IndiceTextos(base_datos)
+        self._raps = {}
+
+    def __len__(self):
+        return len(self.competencias)
+
+    def primera(self):
+        return self.competencias.textos[0] if len(self.competencias) else OTRA
+
+    def raps(self, competencia):
+        return self.base_datos.get(competencia, [])
+
+    def indice_raps(self, competencia):
+        """Índice de los RAP de una competencia (se arma al primer uso)."""
+        indice = self._raps.get(competencia)
+        if indice is None:
+            indice = self._raps[competencia] = IndiceTextos(self.raps(competencia))
+        return indice
+
+    def buscar_competencias(self, consulta, limite=None):
+        return self.competencias.buscar(consulta, limite)
+
+
+_indice_actual = (None, None)
+_lock_indice = threading.Lock()
+
+
+def indice_catalogo(base_datos):
+    """IndiceCatalogo del catálogo; se reutiliza mientras el contenido no cambie."""
+    global _indice_actual
+    version = hashlib.sha256(repr(base_datos).encode()).hexdigest()
+    with _lock_indice:
+        if _indice_actual[0] != version:
+            with etapa("catalogo.indice"):
+                _indice_actual = (version, IndiceCatalogo(base_datos))
+        return _indice_actual[1]
+
+
+# ==========================================
+# CARGA EN SEGUNDO PLANO
+# ==========================================
+class CatalogoEnSegundoPlano:
+    """Catálogo que arranca con la copia local y se refresca en un hilo.
+
+    indice() nunca espera a la red: devuelve el último índice disponible (la
+    copia local, o solo OTRA la primera vez) y, si pasó max_edad desde la
+    última revisión, lanza el refresco en segundo plano.
+    """
+
+    def __init__(self, fuente=None, ruta=RUTA_DB, max_edad=600):
+        self.fuente = fuente or FuenteGoogleSheets()
+        self.ruta = ruta
+        self.max_edad = max_edad
+        self._lock = threading.Lock()
+        self._hilo = None
+        self._lanzado = float('-inf')
+        base_datos = None
+        try:
+            base_datos = CatalogoLocal(ruta).leer()
+        except (sqlite3.Error, OSError) as e:
+            log.warning("No se pudo leer el catálogo local %s: %s", ruta, e)
+        self._indice = indice_catalogo(base_datos or {OTRA: []})
+
+    def _cargar(self):
+        try:
+            indice = indice_catalogo(cargar_catalogo(self.fuente, self.ruta, self.max_edad))
+        except Exception as e:
+            log.warning("No se pudo cargar el catálogo: %s", e)
+            return
+        with self._lock:
+            self._indice = indice
+
+    @property
+    def cargando(self):
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def indice(self):
+        with self._lock:
+            if time.monotonic() - self._lanzado >= self.max_edad and not self.cargando:
+                self._lanzado = time.monotonic()
+                self._hilo = threading.Thread(target=self._cargar, name="catalogo", daemon=True)
+                self._hilo.start()
+            return self._indice
+
+    def esperar(self, timeout=None):
+        """Bloquea hasta que termine el refresco en curso (scripts y pruebas)."""
+        hilo = self._hilo
+        if hilo is not None:
+            hilo.join(timeout)
+        return self._indice
@@ -0,0 +1,116 @@
+"""Reporte consolidado del centro: todos los instructores en un solo PDF.
+
+Uso:
+    python -m nucleo.consolidado --desde 2026-03 --hasta 2026-03 \\
+        --salida consolidado_marzo.pdf [--db datos/historico.sqlite]
+
+Toma los reportes del histórico (ver nucleo.historico). Cada instructor es
+una sección que empieza en página nueva, con marcador en el índice del PDF;
+al final va la página de resumen con los totales por instructor.
+"""
+import argparse
+import os
+import sys
+import time
+
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.platypus import Flowable, PageBreak, SimpleDocTemplate
+
+from nucleo.medicion import medido
+from nucleo.pdf import obtener_plantilla
+
+# ==========================================
+# CONSTRUCCIÓN EN STREAMING
+# ==========================================
+# doc.build consume la lista de flowables desde el frente (len, [0], del [0]
+# y los trozos de una tabla partida se reinsertan adelante). FlujoSecciones
+# se rellena con la siguiente sección solo cuando se vacía, así en memoria
+# vive una sección a la vez y no las de todos los instructores. Lo que sí
+# conserva reportlab son las páginas ya terminadas (comprimidas) hasta
+# escribir el archivo.
+
+
+class FlujoSecciones(list):
+    """Lista de flowables que se rellena de un iterador de secciones."""
+
+    def __init__(self, secciones):
+        super().__init__()
+        self._secciones = iter(secciones)
+
+    def __len__(self):
+        while not list.__len__(self):
+            siguiente = next(self._secciones, None)
+            if siguiente is None:
+                break
+            self.extend(siguiente)
+        return list.__len__(self)
+
+
+class Marcador(Flowable):
+    """Entrada del índice (outline) del PDF en la posición actual."""
+
+    def __init__(self, titulo, clave):
+        Flowable.__init__(self)
+        self.titulo, self.clave = titulo, clave
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.clave)
+        self.canv.addOutlineEntry(self.titulo, self.clave, level=0)
+
+
+def secciones(plantilla, reportes, resumen, titulo):
+    """Una lista de flowables por instructor y, al final, la del resumen."""
+    for i, datos in enumerate(reportes):
+        nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen = datos[:9]
+        n_fichas = len({str(f['ficha']).strip() for f in datos_formacion})
+        resumen.append((nombre, cedula, f"{mes} {anio}", n_fichas, tot_dir, tot_otr, tot_gen))
+        seccion = [PageBreak()] if i else []
+        seccion.append(Marcador(f"{nombre} ({cedula})" if cedula else str(nombre), f"inst{i}"))
+        seccion.extend(plantilla.elementos(*datos))
+        yield seccion
+    yield ([PageBreak()] if resumen else []) + [Marcador("Resumen del centro", "resumen")] + plantilla.elementos_resumen(resumen, titulo)
+
+
+@medido("pdf.consolidado")
+def generar_consolidado(reportes, destino, titulo="RESUMEN DEL CENTRO"):
+    """Escribe el consolidado en `destino` (ruta o archivo binario).
+
+    reportes: iterable (puede ser un generador) de tuplas con los argumentos
+    de crear_pdf. Devuelve {"instructores", "paginas"}.
+    """
+    plantilla = obtener_plantilla()
+    resumen = []
+    doc = SimpleDocTemplate(destino, pagesize=landscape(letter), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30,
+                            title=titulo)
+    doc.build(FlujoSecciones(secciones(plantilla, reportes, resumen, titulo)))
+    return {"instructores": len(resumen), "paginas": doc.page}
+
+
+# ==========================================
+# LÍNEA DE COMANDOS
+# ==========================================
+def main(argv=None):
+    from nucleo.historico import RUTA_HISTORICO, HistoricoReportes, periodo_texto
+
+    parser = argparse.ArgumentParser(description="Genera el PDF consolidado del centro desde el histórico.")
+    parser.add_argument("--desde", type=periodo_texto, help="Periodo inicial AAAA-MM")
+    parser.add_argument("--hasta", type=periodo_texto, help="Periodo final AAAA-MM")
+    parser.add_argument("--salida", default="consolidado.pdf")
+    parser.add_argument("--db", default=RUTA_HISTORICO)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No existe el histórico {args.db}", file=sys.stderr)
+        return 1
+    historico = HistoricoReportes(args.db)
+    t0 = time.perf_counter()
+    res = generar_consolidado(historico.datos_reportes(desde=args.desde, hasta=args.hasta), args.salida)
+    print(f"{res['instructores']} instructores, {res['paginas']} páginas en {time.perf_counter() - t0:.1f} s -> {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
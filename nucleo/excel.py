@@ -0,0 +1,224 @@
+"""Exportación del reporte a Excel (.xlsx) para planeación.
+
+Misma información que imprime crear_pdf, con horas y fechas como valores
+de la hoja: tabla de Formación Directa con HRS MES fusionada por bloque
+contiguo de ficha (nucleo.horas.bloques_hrs_mes), Otras Actividades,
+totales y novedades.
+
+Uso por lotes (un libro con una hoja por instructor y una de resumen):
+    python -m nucleo.excel --desde 2026-03 --hasta 2026-03 --salida centro_marzo.xlsx
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.worksheet.cell_range import CellRange, MultiCellRange
+
+from nucleo.horas import MAPA_DIAS, bloques_hrs_mes
+from nucleo.medicion import medido
+
+# ==========================================
+# HOJAS EN MODO WRITE-ONLY
+# ==========================================
+# Workbook(write_only=True) escribe cada fila al disco temporal en cuanto se
+# agrega, así un libro de todo el centro no guarda las celdas en memoria.
+# Los estilos son NamedStyle registrados una vez por libro: a cada celda se
+# le asigna un nombre en vez de fuente, borde y relleno por separado. Anchos
+# y paneles fijos van antes de la primera fila (se escriben con la cabecera
+# de la hoja); las fusiones de HRS MES al final (van en su cola, que se
+# escribe al cerrarla).
+ENCABEZADO_DIRECTA = ["FICHA", "DESDE", "HASTA", "L", "M", "MI", "J", "V", "S", "COMPETENCIA", "RAP", "EVAL", "TERM", "HRS", "HRS MES"]
+ENCABEZADO_OTRAS = ["ACTIVIDAD", "FECHA DESDE", "FECHA HASTA", "CANT. DÍAS", "HRS"]
+ENCABEZADO_RESUMEN = ["INSTRUCTOR", "CÉDULA", "PERIODO", "FICHAS", "HRS DIRECTAS", "HRS OTRAS", "TOTAL"]
+ANCHOS_DIRECTA = [11, 8, 8, 4, 4, 4, 4, 4, 4, 45, 55, 7, 7, 8, 10]
+ANCHOS_RESUMEN = [40, 14, 16, 8, 14, 12, 10]
+COL_HRS_MES = "O"
+
+_borde = Side(style="thin", color="000000")
+_BORDES = Border(left=_borde, right=_borde, top=_borde, bottom=_borde)
+_CENTRO = Alignment(horizontal="center", vertical="center")
+_GRIS = PatternFill("solid", fgColor="D3D3D3")
+ESTILOS = [
+    NamedStyle("rep_titulo", font=Font(bold=True, size=12)),
+    NamedStyle("rep_subtitulo", font=Font(bold=True, size=10)),
+    NamedStyle("rep_encabezado", font=Font(bold=True, size=9), fill=_GRIS, border=_BORDES, alignment=_CENTRO),
+    NamedStyle("rep_celda", font=Font(size=9), border=_BORDES, alignment=_CENTRO),
+    NamedStyle("rep_texto", font=Font(size=9), border=_BORDES, alignment=Alignment(vertical="center", wrap_text=True)),
+    NamedStyle("rep_hora", font=Font(size=9), border=_BORDES, alignment=_CENTRO, number_format="hh:mm"),
+    NamedStyle("rep_fecha", font=Font(size=9), border=_BORDES, alignment=_CENTRO, number_format="dd/mm/yyyy"),
+    NamedStyle("rep_hrs_mes", font=Font(bold=True, size=9), border=_BORDES, alignment=_CENTRO,
+               fill=PatternFill("solid", fgColor="EDF7FF")),
+    NamedStyle("rep_total", font=Font(bold=True, size=9), border=_BORDES, alignment=_CENTRO),
+]
+_INVALIDOS_HOJA = re.compile(r"[\[\]:*?/\\]")
+
+
+def nuevo_libro():
+    """Workbook write-only con los estilos del reporte registrados."""
+    libro = Workbook(write_only=True)
+    for estilo in ESTILOS:
+        libro.add_named_style(estilo)
+    return libro
+
+
+def titulo_hoja(nombre, usados):
+    """Nombre de hoja válido (≤ 31 caracteres, sin []:*?/\\) y no repetido en `usados`."""
+    base = _INVALIDOS_HOJA.sub(" ", str(nombre)).strip()[:31] or "Hoja"
+    titulo, n = base, 1
+    while titulo.lower() in usados:
+        n += 1
+        sufijo = f" ({n})"
+        titulo = base[:31 - len(sufijo)] + sufijo
+    usados.add(titulo.lower())
+    return titulo
+
+
+def _celdas(hoja, valores, estilo):
+    """Fila de WriteOnlyCell con el mismo estilo (None deja la celda vacía)."""
+    fila = []
+    for v in valores:
+        celda = WriteOnlyCell(hoja, value=v)
+        celda.style = estilo
+        fila.append(celda)
+    return fila
+
+
+def _celda(hoja, valor, estilo):
+    celda = WriteOnlyCell(hoja, value=valor)
+    celda.style = estilo
+    return celda
+
+
+def escribir_hoja(libro, titulo, nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+    """Agrega al libro la hoja del reporte de un instructor. Devuelve las filas de fichas escritas."""
+    hoja = libro.create_sheet(titulo)
+    for i, ancho in enumerate(ANCHOS_DIRECTA):
+        hoja.column_dimensions[chr(ord("A") + i)].width = ancho
+    hoja.freeze_panes = "A7"  # encabezado de la tabla directa siempre visible
+
+    hoja.append([_celda(hoja, "CENTRO INDUSTRIAL Y DE ENERGIAS ALTERNATIVAS - REGIONAL GUAJIRA", "rep_titulo")])
+    hoja.append([_celda(hoja, "REPORTE ESTADISTICO DE HORAS MENSUALES INSTRUCTOR", "rep_titulo")])
+    hoja.append(["INSTRUCTOR:", nombre, None, None, None, None, None, None, None, "CÉDULA:", cedula, "MES:", f"{mes} / {anio}"])
+    hoja.append([])
+    hoja.append([_celda(hoja, "PARTE HORAS DIRECTAS - PROGRAMAS EN FORMACIÓN TITULADA", "rep_subtitulo")])
+    hoja.append(_celdas(hoja, ENCABEZADO_DIRECTA, "rep_encabezado"))
+    primera_fila = 7  # fila de Excel de datos_formacion[0]
+
+    bloques = bloques_hrs_mes(datos_formacion)
+    hrs_mes = {primera: horas for primera, _, horas in bloques}
+    for i, f in enumerate(datos_formacion):
+        dias = f['dias']
+        hoja.append(
+            [_celda(hoja, f['ficha'], "rep_celda"),
+             _celda(hoja, f['h_inicio'], "rep_hora"), _celda(hoja, f['h_fin'], "rep_hora")]
+            + _celdas(hoja, ["X" if dias.get(d) else None for d in MAPA_DIAS], "rep_celda")
+            + [_celda(hoja, f['competencia'], "rep_texto"), _celda(hoja, f['rap'], "rep_texto")]
+            + _celdas(hoja, [f.get('evaluado', 'NO'), f.get('termino', 'NO'), f['horas']], "rep_celda")
+            + [_celda(hoja, hrs_mes.get(i), "rep_hrs_mes")]
+        )
+    hoja.append([None] * 13 + _celdas(hoja, ["TOTAL:", tot_dir], "rep_total"))
+
+    if datos_otras:
+        hoja.append([])
+        hoja.append([_celda(hoja, "PARTE OTRAS ACTIVIDADES INSTRUCTORES PLANTA", "rep_subtitulo")])
+        hoja.append(_celdas(hoja, ENCABEZADO_OTRAS, "rep_encabezado"))
+        for of in datos_otras:
+            hoja.append([_celda(hoja, of['actividad'], "rep_texto"), _celda(hoja, of['f_desde'], "rep_fecha"),
+                         _celda(hoja, of['f_hasta'], "rep_fecha")] + _celdas(hoja, [of['dias'], of['horas']], "rep_celda"))
+        hoja.append([None] * 3 + _celdas(hoja, ["TOTAL OTRAS:", tot_otr], "rep_total"))
+
+    hoja.append([])
+    hoja.append([_celda(hoja, "TOTAL HORAS REPORTADAS EN EL MES:", "rep_subtitulo"), None, None, None, None, None, None, None, None,
+                 _celda(hoja, tot_gen, "rep_subtitulo")])
+    if novedades_globales:
+        hoja.append(["Novedades/Festivos aplicados:", ", ".join(n.strftime("%d/%m/%Y") for n in novedades_globales)])
+    hoja.append([f"Reporte generado el: {datetime.now().strftime('%d/%m/%Y %I:%M %p')}"])
+
+    # Los bloques no se solapan: se arma el rango completo de una vez (add() revisa contra todos los anteriores)
+    hoja.merged_cells = MultiCellRange([
+        CellRange(f"{COL_HRS_MES}{primera_fila + primera}:{COL_HRS_MES}{primera_fila + ultima}")
+        for primera, ultima, _ in bloques if ultima > primera
+    ])
+    # Cerrar la hoja escribe su cola y suelta el escritor XML; si no, cada hoja
+    # lo conserva abierto hasta libro.save()
+    hoja.close()
+    return len(datos_formacion)
+
+
+@medido("xlsx.crear")
+def crear_xlsx(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+    """Bytes del .xlsx de un instructor; mismos argumentos que crear_pdf."""
+    libro = nuevo_libro()
+    escribir_hoja(libro, titulo_hoja(f"{mes} {anio}", set()), nombre, cedula, mes, anio, datos_formacion, datos_otras,
+                  tot_dir, tot_otr, tot_gen, novedades_globales)
+    buffer = BytesIO()
+    libro.save(buffer)
+    return buffer.getvalue()
+
+
+@medido("xlsx.consolidado")
+def generar_libro_centro(reportes, destino, titulo="RESUMEN DEL CENTRO"):
+    """Libro con la hoja RESUMEN y una hoja por instructor, escrito en `destino`.
+
+    reportes: iterable (puede ser un generador) de tuplas con los argumentos
+    de crear_pdf; cada reporte se escribe y se suelta. Devuelve
+    {"instructores", "filas"}.
+    """
+    libro = nuevo_libro()
+    usados = {"resumen"}
+    # Se crea primero para que quede como la primera pestaña; se llena al final
+    resumen = libro.create_sheet("RESUMEN")
+    for i, ancho in enumerate(ANCHOS_RESUMEN):
+        resumen.column_dimensions[chr(ord("A") + i)].width = ancho
+    resumen.freeze_panes = "A4"
+    filas_resumen, n_filas = [], 0
+    for datos in reportes:
+        nombre, cedula, mes, anio, datos_formacion, _, tot_dir, tot_otr, tot_gen = datos[:9]
+        n_filas += escribir_hoja(libro, titulo_hoja(nombre, usados), *datos)
+        n_fichas = len({str(f['ficha']).strip() for f in datos_formacion})
+        filas_resumen.append((nombre, cedula, f"{mes} {anio}", n_fichas, tot_dir, tot_otr, tot_gen))
+
+    resumen.append([_celda(resumen, titulo, "rep_titulo")])
+    resumen.append([])
+    resumen.append(_celdas(resumen, ENCABEZADO_RESUMEN, "rep_encabezado"))
+    for fila in filas_resumen:
+        resumen.append([_celda(resumen, fila[0], "rep_texto")] + _celdas(resumen, fila[1:], "rep_celda"))
+    resumen.append(_celdas(resumen, [f"{len(filas_resumen)} instructores", None, None, "TOTAL:",
+                                     sum(f[4] for f in filas_resumen), sum(f[5] for f in filas_resumen),
+                                     sum(f[6] for f in filas_resumen)], "rep_total"))
+    libro.save(destino)
+    return {"instructores": len(filas_resumen), "filas": n_filas}
+
+
+# ==========================================
+# LÍNEA DE COMANDOS
+# ==========================================
+def main(argv=None):
+    from nucleo.historico import RUTA_HISTORICO, HistoricoReportes, periodo_texto
+
+    parser = argparse.ArgumentParser(description="Exporta a Excel los reportes del histórico (una hoja por instructor).")
+    parser.add_argument("--desde", type=periodo_texto, help="Periodo inicial AAAA-MM")
+    parser.add_argument("--hasta", type=periodo_texto, help="Periodo final AAAA-MM")
+    parser.add_argument("--salida", default="reportes.xlsx")
+    parser.add_argument("--db", default=RUTA_HISTORICO)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No existe el histórico {args.db}", file=sys.stderr)
+        return 1
+    historico = HistoricoReportes(args.db)
+    t0 = time.perf_counter()
+    res = generar_libro_centro(historico.datos_reportes(desde=args.desde, hasta=args.hasta), args.salida)
+    print(f"{res['instructores']} instructores, {res['filas']} filas en {time.perf_counter() - t0:.1f} s -> {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
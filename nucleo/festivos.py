@@ -0,0 +1,124 @@
+"""Festivos de Colombia, calculados una vez por año.
+
+Ley 51 de 1983 ("Ley Emiliani"): unos festivos son de fecha fija, otros se
+trasladan al lunes siguiente si no caen en lunes, y los que dependen de la
+Pascua se cuentan desde el domingo de Resurrección (algunos también se
+trasladan al lunes).
+
+    python -m nucleo.festivos 2026 [2027 ...]
+"""
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+
+# ==========================================
+# REGLAS
+# ==========================================
+# (mes, día, nombre)
+FIJOS = [
+    (1, 1, "Año Nuevo"),
+    (5, 1, "Día del Trabajo"),
+    (7, 20, "Día de la Independencia"),
+    (8, 7, "Batalla de Boyacá"),
+    (12, 8, "Inmaculada Concepción"),
+    (12, 25, "Navidad"),
+]
+# Se trasladan al lunes siguiente (Ley Emiliani)
+TRASLADABLES = [
+    (1, 6, "Reyes Magos"),
+    (3, 19, "San José"),
+    (6, 29, "San Pedro y San Pablo"),
+    (8, 15, "Asunción de la Virgen"),
+    (10, 12, "Día de la Raza"),
+    (11, 1, "Todos los Santos"),
+    (11, 11, "Independencia de Cartagena"),
+]
+# (días desde el domingo de Pascua, se traslada al lunes, nombre)
+PASCUA = [
+    (-3, False, "Jueves Santo"),
+    (-2, False, "Viernes Santo"),
+    (39, True, "Ascensión del Señor"),
+    (60, True, "Corpus Christi"),
+    (68, True, "Sagrado Corazón"),
+]
+
+
+def domingo_de_pascua(anio):
+    """Domingo de Pascua del calendario gregoriano (algoritmo de Meeus/Jones/Butcher)."""
+    a, b, c = anio % 19, anio // 100, anio % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes = (h + l - 7 * m + 114) // 31
+    dia = (h + l - 7 * m + 114) % 31 + 1
+    return date(anio, mes, dia)
+
+
+def _al_lunes(fecha):
+    return fecha + timedelta(days=-fecha.weekday() % 7)
+
+
+# ==========================================
+# FESTIVOS POR AÑO (CACHÉ)
+# ==========================================
+@lru_cache(maxsize=None)
+def festivos_anio(anio):
+    """((fecha, nombre), ...) del año, ordenados por fecha y sin fechas repetidas.
+
+    Dos festivos trasladados pueden caer el mismo lunes (30/06/2025: Sagrado
+    Corazón y San Pedro); quedan en una sola entrada con ambos nombres.
+    """
+    festivos = [(date(anio, m, d), nombre) for m, d, nombre in FIJOS]
+    festivos += [(_al_lunes(date(anio, m, d)), nombre) for m, d, nombre in TRASLADABLES]
+    pascua = domingo_de_pascua(anio)
+    for dias, trasladable, nombre in PASCUA:
+        fecha = pascua + timedelta(days=dias)
+        festivos.append((_al_lunes(fecha) if trasladable else fecha, nombre))
+    por_fecha = {}
+    for fecha, nombre in sorted(festivos):
+        por_fecha[fecha] = f"{por_fecha[fecha]} / {nombre}" if fecha in por_fecha else nombre
+    return tuple(por_fecha.items())
+
+
+@lru_cache(maxsize=None)
+def _fechas_anio(anio):
+    return tuple(f for f, _ in festivos_anio(anio))
+
+
+def festivos_rango(desde, hasta):
+    """[(fecha, nombre)] con desde <= fecha <= hasta; el rango puede cruzar años."""
+    resultado = []
+    for anio in range(desde.year, hasta.year + 1):
+        fechas = _fechas_anio(anio)
+        resultado.extend(festivos_anio(anio)[bisect_left(fechas, desde):bisect_right(fechas, hasta)])
+    return resultado
+
+
+def festivos_mes(anio, mes):
+    """Fechas festivas del mes (mes 1-12)."""
+    return [f for f, _ in festivos_anio(anio) if f.month == mes]
+
+
+def nombre_festivo(fecha):
+    """Nombre del festivo de esa fecha o None."""
+    fechas = _fechas_anio(fecha.year)
+    i = bisect_left(fechas, fecha)
+    return festivos_anio(fecha.year)[i][1] if i < len(fechas) and fechas[i] == fecha else None
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    for anio in [int(a) for a in argv] or [date.today().year]:
+        print(f"Festivos {anio} (Pascua: {domingo_de_pascua(anio):%d/%m})")
+        for fecha, nombre in festivos_anio(anio):
+            print(f"  {fecha:%d/%m/%Y} {fecha:%a}  {nombre}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
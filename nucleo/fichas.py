@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from nucleo.horario import DIAS_NOM
+
+# ==========================================
+# TABLA DE FICHAS (FORMACIÓN DIRECTA)
+# ==========================================
+# La interfaz muestra las fichas en una sola tabla editable y un panel de
+# detalle para la fila elegida. La herencia entre filas de la misma ficha se
+# resuelve aquí sobre la lista completa, no widget por widget.
+CAMPOS_HEREDADOS = ("competencia", "rap", "evaluado", "termino")
+COLUMNAS_EDITABLES = ["Ficha", "Inicio", "Fin"] + DIAS_NOM
+
+
+def aplicar_herencia(filas):
+    """Copia competencia/RAP/estado de la primera aparición de cada ficha.
+
+    Devuelve una lista de bool: True en las filas que heredan (misma ficha que
+    una fila anterior). Las fichas vacías no heredan.
+    """
+    if not filas:
+        return []
+    claves = pd.Series([f['ficha'] for f in filas], dtype=object).astype(str).str.strip()
+    origen = pd.Series(np.arange(len(filas))).groupby(claves.to_numpy(), sort=False).transform('first').to_numpy()
+    heredadas = (claves.to_numpy() != "") & (origen != np.arange(len(filas)))
+    for i in np.flatnonzero(heredadas).tolist():
+        primera = filas[origen[i]]
+        for campo in CAMPOS_HEREDADOS:
+            filas[i][campo] = primera.get(campo, "NO")
+    return heredadas.tolist()
+
+
+def tabla_fichas(filas, heredadas):
+    """DataFrame compacto de las fichas para st.data_editor."""
+    return pd.DataFrame({
+        "Ficha": [f['ficha'] for f in filas],
+        "Inicio": [f['h_inicio'] for f in filas],
+        "Fin": [f['h_fin'] for f in filas],
+        **{d: [bool(f['dias'].get(d, False)) for f in filas] for d in DIAS_NOM},
+        "Horas": [float(f.get('horas', 0)) for f in filas],
+        "Competencia": [f['competencia'] for f in filas],
+        "RAP": [f['rap'] for f in filas],
+        "Evaluado": [f.get('evaluado', 'NO') for f in filas],
+        "Terminó": [f.get('termino', 'NO') for f in filas],
+        "Vinculada": list(heredadas),
+    }, columns=COLUMNAS_EDITABLES + ["Horas", "Competencia", "RAP", "Evaluado", "Terminó", "Vinculada"])
+
+
+def _valores_fila(fila, nueva):
+    return {
+        'ficha': "" if pd.isna(nueva["Ficha"]) else str(nueva["Ficha"]),
+        # Una hora borrada en la tabla conserva la anterior
+        'h_inicio': fila['h_inicio'] if pd.isna(nueva["Inicio"]) else nueva["Inicio"],
+        'h_fin': fila['h_fin'] if pd.isna(nueva["Fin"]) else nueva["Fin"],
+        'dias': {d: bool(nueva[d]) for d in DIAS_NOM},
+    }
+
+
+def aplicar_tabla(filas, original, editada):
+    """Pasa a las filas las celdas editables que cambiaron. True si hubo cambios.
+
+    Solo cuenta como cambio lo que altera la fila (una celda vaciada que se
+    ignora no vuelve a disparar un rerun).
+    """
+    candidatas = (editada[COLUMNAS_EDITABLES] != original[COLUMNAS_EDITABLES]).any(axis=1).to_numpy()
+    hubo = False
+    for i in np.flatnonzero(candidatas).tolist():
+        valores = _valores_fila(filas[i], editada.iloc[i])
+        if any(filas[i][k] != v for k, v in valores.items()):
+            filas[i].update(valores)
+            hubo = True
+    return hubo
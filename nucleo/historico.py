@@ -0,0 +1,347 @@
+"""Histórico de reportes enviados y estadísticas del centro.
+
+Uso:
+    python -m nucleo.historico --desde 2026-01 --hasta 2026-06 [--instructor ...]
+        [--cedula ...] [--ficha ...] [--csv carpeta] [--db ruta]
+
+Cada PDF descargado guarda aquí sus fichas, otras actividades, novedades y
+totales (SQLite de la librería estándar). Las estadísticas se calculan con
+GROUP BY en SQLite sobre los índices (instructor, cédula, periodo, ficha,
+competencia) y se devuelven como DataFrames, sin recorrer reportes en Python.
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, time as hora
+
+import pandas as pd
+
+from nucleo.cache import huella_reporte
+from nucleo.horas import MAPA_DIAS, MESES, mascara_dias
+from nucleo.medicion import medido
+
+RUTA_HISTORICO = os.environ.get(
+    "REPORTE_HISTORICO_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos", "historico.sqlite"),
+)
+
+log = logging.getLogger(__name__)
+
+# ==========================================
+# ESQUEMA
+# ==========================================
+# periodo = año * 100 + mes, para filtrar rangos de meses con un solo índice.
+# Un instructor tiene un reporte por mes: reenviarlo reemplaza el anterior.
+# fichas repite periodo y cédula para agregar sin JOIN, y marca `vinculada`
+# las filas que heredan el RAP de la primera aparición de su ficha (el RAP
+# cuenta una sola vez). Los índices de ficha y competencia cubren las
+# consultas agregadas, que se resuelven sin leer la tabla.
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS reportes (
+    id INTEGER PRIMARY KEY,
+    huella TEXT NOT NULL UNIQUE,
+    instructor TEXT NOT NULL,
+    cedula TEXT NOT NULL,
+    anio INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    periodo INTEGER NOT NULL,
+    tot_dir REAL NOT NULL,
+    tot_otr REAL NOT NULL,
+    tot_gen REAL NOT NULL,
+    creado REAL NOT NULL,
+    UNIQUE (instructor, cedula, periodo)
+);
+CREATE INDEX IF NOT EXISTS idx_reportes_instructor ON reportes (instructor);
+CREATE INDEX IF NOT EXISTS idx_reportes_cedula ON reportes (cedula);
+CREATE INDEX IF NOT EXISTS idx_reportes_periodo ON reportes (periodo);
+
+CREATE TABLE IF NOT EXISTS fichas (
+    reporte_id INTEGER NOT NULL REFERENCES reportes (id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    periodo INTEGER NOT NULL,
+    cedula TEXT NOT NULL,
+    ficha TEXT NOT NULL,
+    h_inicio TEXT,
+    h_fin TEXT,
+    dias INTEGER NOT NULL,
+    competencia TEXT,
+    rap TEXT,
+    horas REAL NOT NULL,
+    evaluado INTEGER NOT NULL,
+    termino INTEGER NOT NULL,
+    vinculada INTEGER NOT NULL,
+    PRIMARY KEY (reporte_id, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_fichas_periodo ON fichas (periodo);
+CREATE INDEX IF NOT EXISTS idx_fichas_cedula ON fichas (cedula, periodo);
+CREATE INDEX IF NOT EXISTS idx_fichas_ficha ON fichas (ficha, horas, reporte_id, cedula);
+CREATE INDEX IF NOT EXISTS idx_fichas_competencia ON fichas (competencia, ficha, horas, vinculada, evaluado, termino);
+
+CREATE TABLE IF NOT EXISTS otras (
+    reporte_id INTEGER NOT NULL REFERENCES reportes (id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    actividad TEXT,
+    f_desde TEXT,
+    f_hasta TEXT,
+    dias REAL,
+    horas REAL NOT NULL,
+    PRIMARY KEY (reporte_id, pos)
+);
+
+CREATE TABLE IF NOT EXISTS novedades (
+    reporte_id INTEGER NOT NULL REFERENCES reportes (id) ON DELETE CASCADE,
+    fecha TEXT NOT NULL,
+    PRIMARY KEY (reporte_id, fecha)
+);
+"""
+
+
+def periodo(anio, mes):
+    """(2026, "Marzo", 3 o "03") -> 202603."""
+    mes = MESES.index(mes) + 1 if mes in MESES else int(mes)
+    return int(anio) * 100 + mes
+
+
+def _hora(h):
+    return h.strftime("%H:%M") if h is not None else None
+
+
+def _a_hora(texto):
+    return hora.fromisoformat(texto) if texto else None
+
+
+def _si(valor):
+    return 1 if valor == "SÍ" else 0
+
+
+class HistoricoReportes:
+    """Archivo SQLite de reportes enviados con consultas agregadas."""
+
+    def __init__(self, ruta=RUTA_HISTORICO):
+        self.ruta = ruta
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with self._conectar() as con:
+            con.executescript(ESQUEMA)
+
+    @contextmanager
+    def _conectar(self):
+        con = sqlite3.connect(self.ruta, timeout=30)
+        con.execute("PRAGMA foreign_keys = ON")
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    # ------------------------------------------
+    # Escritura
+    # ------------------------------------------
+    def _insertar(self, con, nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+        clave = huella_reporte(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales)
+        existente = con.execute("SELECT id FROM reportes WHERE huella = ?", (clave,)).fetchone()
+        if existente:
+            return existente[0]
+        p = periodo(anio, mes)
+        nombre, cedula = str(nombre).strip(), str(cedula).strip()
+        con.execute("DELETE FROM reportes WHERE instructor = ? AND cedula = ? AND periodo = ?", (nombre, cedula, p))
+        rid = con.execute(
+            "INSERT INTO reportes (huella, instructor, cedula, anio, mes, periodo, tot_dir, tot_otr, tot_gen, creado)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (clave, nombre, cedula, p // 100, p % 100, p, float(tot_dir), float(tot_otr), float(tot_gen), time.time()),
+        ).lastrowid
+        vistas, filas = set(), []
+        for i, f in enumerate(datos_formacion):
+            ficha = str(f['ficha']).strip()
+            vinculada = int(ficha != "" and ficha in vistas)
+            vistas.add(ficha)
+            filas.append((rid, i, p, cedula, ficha, _hora(f['h_inicio']), _hora(f['h_fin']), mascara_dias(f['dias']),
+                          f.get('competencia'), f.get('rap'), float(f.get('horas', 0)),
+                          _si(f.get('evaluado')), _si(f.get('termino')), vinculada))
+        con.executemany(
+            "INSERT INTO fichas (reporte_id, pos, periodo, cedula, ficha, h_inicio, h_fin, dias, competencia, rap,"
+            " horas, evaluado, termino, vinculada) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", filas)
+        con.executemany(
+            "INSERT INTO otras (reporte_id, pos, actividad, f_desde, f_hasta, dias, horas) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(rid, i, o['actividad'], str(o['f_desde']), str(o['f_hasta']), float(o['dias']), float(o['horas']))
+             for i, o in enumerate(datos_otras)],
+        )
+        con.executemany("INSERT OR IGNORE INTO novedades (reporte_id, fecha) VALUES (?, ?)",
+                        [(rid, str(d)) for d in novedades_globales])
+        return rid
+
+    @medido("historico.guardar")
+    def guardar(self, *datos_reporte):
+        """Guarda un reporte con los mismos argumentos de crear_pdf. Devuelve su id."""
+        with self._conectar() as con:
+            return self._insertar(con, *datos_reporte)
+
+    def guardar_varios(self, reportes):
+        """Guarda muchos reportes en una sola transacción (importaciones, lotes)."""
+        with self._conectar() as con:
+            return [self._insertar(con, *datos) for datos in reportes]
+
+    def archivar(self, *datos_reporte):
+        """Como guardar, pero un fallo del disco no interrumpe la descarga del PDF."""
+        try:
+            return self.guardar(*datos_reporte)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            log.warning("No se pudo archivar el reporte en %s: %s", self.ruta, e)
+            return None
+
+    # ------------------------------------------
+    # Consultas
+    # ------------------------------------------
+    @staticmethod
+    def _filtros(alias, desde=None, hasta=None, instructor=None, cedula=None, ficha=None):
+        """WHERE sobre reportes (alias "r") o sobre fichas (alias "f")."""
+        condiciones, params = [], []
+        if desde is not None:
+            condiciones.append(f"{alias}.periodo >= ?")
+            params.append(desde)
+        if hasta is not None:
+            condiciones.append(f"{alias}.periodo <= ?")
+            params.append(hasta)
+        if cedula:
+            condiciones.append(f"{alias}.cedula = ?")
+            params.append(cedula)
+        if instructor:
+            id_reporte = "r.id" if alias == "r" else "f.reporte_id"
+            condiciones.append(f"{id_reporte} IN (SELECT id FROM reportes WHERE instructor = ?)")
+            params.append(instructor)
+        if ficha:
+            condiciones.append("f.ficha = ?" if alias == "f" else "r.id IN (SELECT reporte_id FROM fichas WHERE ficha = ?)")
+            params.append(ficha)
+        return (" WHERE " + " AND ".join(condiciones)) if condiciones else "", params
+
+    def _consulta(self, sql, params=()):
+        with self._conectar() as con:
+            return pd.read_sql_query(sql, con, params=params)
+
+    @medido("historico.consulta")
+    def reportes(self, **filtros):
+        donde, params = self._filtros("r", **filtros)
+        return self._consulta(
+            "SELECT r.id, r.instructor, r.cedula, r.anio, r.mes, r.tot_dir, r.tot_otr, r.tot_gen, r.creado"
+            f" FROM reportes r{donde} ORDER BY r.periodo, r.instructor", params)
+
+    def datos_reportes(self, **filtros):
+        """Reportes guardados, uno a la vez, como tuplas con los argumentos de crear_pdf."""
+        donde, params = self._filtros("r", **filtros)
+        with self._conectar() as con:
+            cabeceras = con.execute(
+                "SELECT r.id, r.instructor, r.cedula, r.mes, r.anio, r.tot_dir, r.tot_otr, r.tot_gen"
+                f" FROM reportes r{donde} ORDER BY r.periodo, r.instructor", params).fetchall()
+            for rid, nombre, cedula, mes, anio, tot_dir, tot_otr, tot_gen in cabeceras:
+                formacion = [
+                    {"ficha": ficha, "h_inicio": _a_hora(h_ini), "h_fin": _a_hora(h_fin),
+                     "dias": {d: bool(dias >> b & 1) for d, b in MAPA_DIAS.items()}, "competencia": comp, "rap": rap,
+                     "horas": horas, "evaluado": "SÍ" if ev else "NO", "termino": "SÍ" if tm else "NO"}
+                    for ficha, h_ini, h_fin, dias, comp, rap, horas, ev, tm in con.execute(
+                        "SELECT ficha, h_inicio, h_fin, dias, competencia, rap, horas, evaluado, termino"
+                        " FROM fichas WHERE reporte_id = ? ORDER BY pos", (rid,))
+                ]
+                otras = [
+                    {"actividad": act, "f_desde": date.fromisoformat(desde), "f_hasta": date.fromisoformat(hasta),
+                     "dias": dias, "horas": horas}
+                    for act, desde, hasta, dias, horas in con.execute(
+                        "SELECT actividad, f_desde, f_hasta, dias, horas FROM otras WHERE reporte_id = ? ORDER BY pos", (rid,))
+                ]
+                novedades = [date.fromisoformat(f) for (f,) in con.execute(
+                    "SELECT fecha FROM novedades WHERE reporte_id = ? ORDER BY fecha", (rid,))]
+                yield (nombre, cedula, MESES[mes - 1], str(anio), formacion, otras, tot_dir, tot_otr, tot_gen, novedades)
+
+    @medido("historico.consulta")
+    def horas_por_instructor(self, **filtros):
+        donde, params = self._filtros("r", **filtros)
+        return self._consulta(
+            "SELECT r.instructor, r.cedula, COUNT(*) AS meses, SUM(r.tot_dir) AS horas_directa,"
+            " SUM(r.tot_otr) AS horas_otras, SUM(r.tot_gen) AS horas_total"
+            f" FROM reportes r{donde} GROUP BY r.instructor, r.cedula ORDER BY horas_total DESC", params)
+
+    @medido("historico.consulta")
+    def horas_por_mes(self, **filtros):
+        donde, params = self._filtros("r", **filtros)
+        return self._consulta(
+            "SELECT r.anio, r.mes, COUNT(*) AS reportes, SUM(r.tot_dir) AS horas_directa,"
+            " SUM(r.tot_otr) AS horas_otras, SUM(r.tot_gen) AS horas_total"
+            f" FROM reportes r{donde} GROUP BY r.periodo ORDER BY r.periodo", params)
+
+    @medido("historico.consulta")
+    def horas_por_ficha(self, **filtros):
+        donde, params = self._filtros("f", **filtros)
+        return self._consulta(
+            "SELECT f.ficha, SUM(f.horas) AS horas, COUNT(DISTINCT f.reporte_id) AS reportes,"
+            " COUNT(DISTINCT f.cedula) AS instructores"
+            f" FROM fichas f{donde} GROUP BY f.ficha ORDER BY horas DESC", params)
+
+    @medido("historico.consulta")
+    def horas_por_competencia(self, **filtros):
+        donde, params = self._filtros("f", **filtros)
+        return self._consulta(
+            "SELECT f.competencia, SUM(f.horas) AS horas, COUNT(DISTINCT f.ficha) AS fichas"
+            f" FROM fichas f{donde} GROUP BY f.competencia ORDER BY horas DESC", params)
+
+    @medido("historico.consulta")
+    def estado_raps(self, **filtros):
+        """Razón de RAP evaluados y terminados por competencia.
+
+        Cada RAP cuenta una vez por reporte y ficha: las filas vinculadas
+        repiten el RAP de la primera aparición de su ficha.
+        """
+        donde, params = self._filtros("f", **filtros)
+        donde = (donde + " AND" if donde else " WHERE") + " f.vinculada = 0"
+        return self._consulta(
+            "SELECT f.competencia, COUNT(*) AS raps, AVG(f.evaluado) AS razon_evaluados, AVG(f.termino) AS razon_terminados"
+            f" FROM fichas f{donde} GROUP BY f.competencia ORDER BY raps DESC", params)
+
+
+# ==========================================
+# LÍNEA DE COMANDOS
+# ==========================================
+def periodo_texto(texto):
+    """"2026-03" -> 202603 (argumentos de línea de comandos)."""
+    anio, mes = texto.split("-")
+    return periodo(anio, mes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estadísticas del centro a partir del histórico de reportes.")
+    parser.add_argument("--desde", type=periodo_texto, help="Periodo inicial AAAA-MM")
+    parser.add_argument("--hasta", type=periodo_texto, help="Periodo final AAAA-MM")
+    parser.add_argument("--instructor")
+    parser.add_argument("--cedula")
+    parser.add_argument("--ficha")
+    parser.add_argument("--csv", help="Carpeta donde escribir cada tabla como CSV")
+    parser.add_argument("--db", default=RUTA_HISTORICO)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No existe el histórico {args.db}", file=sys.stderr)
+        return 1
+    historico = HistoricoReportes(args.db)
+    filtros = dict(desde=args.desde, hasta=args.hasta, instructor=args.instructor, cedula=args.cedula, ficha=args.ficha)
+    tablas = {
+        "horas_por_mes": historico.horas_por_mes,
+        "horas_por_instructor": historico.horas_por_instructor,
+        "horas_por_ficha": historico.horas_por_ficha,
+        "horas_por_competencia": historico.horas_por_competencia,
+        "estado_raps": historico.estado_raps,
+    }
+    if args.csv:
+        os.makedirs(args.csv, exist_ok=True)
+    for nombre, consulta in tablas.items():
+        t0 = time.perf_counter()
+        df = consulta(**filtros)
+        print(f"\n== {nombre} ({len(df)} filas, {(time.perf_counter() - t0) * 1000:.0f} ms)")
+        print(df.head(20).to_string(index=False))
+        if args.csv:
+            df.to_csv(os.path.join(args.csv, f"{nombre}.csv"), index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
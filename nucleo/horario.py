@@ -0,0 +1,252 @@
+import zipfile
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from nucleo.cache import huella, leer_bytes
+from nucleo.medicion import medido
+
+# ==========================================
+# LECTOR DEL HORARIO OFICIAL (HORARIOINSTRUCTOR)
+# ==========================================
+# Motor vectorizado: la columna HORA se interpreta una sola vez con
+# str.extract y los tramos contiguos de cada ficha se detectan comparando
+# cada celda con la anterior (shift), sin recorrer la hoja celda por celda.
+DIAS_NOM = ["L", "M", "Mi", "J", "V", "S"]
+# Subir al cambiar la forma de `agrupados`: invalida la caché de horarios
+VERSION_LECTOR = "3"
+FILAS_ENCABEZADO = 40
+PATRON_HORA = r'(?s)(\d{1,2}:\d{2}).*?(\d{1,2}:\d{2})'
+
+
+def buscar_hoja(nombres_hojas):
+    """Devuelve la primera hoja de horario del libro, o None si no hay."""
+    return next((n for n in nombres_hojas if "HORARIOINSTRUCTOR" in n.upper() or "INSTRUCTORHORARIO" in n.upper()), None)
+
+
+def ubicar_encabezado(df_h):
+    """Devuelve (hora_col, start_row, grupo_cols) o None si no se reconoce.
+
+    Como en el formato oficial, vale la última fila con una celda 'HORA' de
+    las primeras 40, y se toma como columna de día toda columna que tenga
+    'GRUPO' en alguna de esas filas.
+    """
+    bloque = df_h.iloc[:FILAS_ENCABEZADO]
+    cab = pd.Series(bloque.to_numpy().ravel()).astype(str).str.strip().str.upper()
+    es_hora = (cab == 'HORA').fillna(False).to_numpy(dtype=bool).reshape(bloque.shape)
+    es_grupo = cab.str.contains('GRUPO', regex=False, na=False).to_numpy(dtype=bool).reshape(bloque.shape)
+    filas_hora = np.flatnonzero(es_hora.any(axis=1))
+    grupo_cols = np.flatnonzero(es_grupo.any(axis=0))
+    if len(filas_hora) == 0 or len(grupo_cols) == 0:
+        return None
+    r = filas_hora[-1]
+    return int(np.argmax(es_hora[r])), int(r) + 1, [int(c) for c in grupo_cols]
+
+
+def tabla_bloques(df_h):
+    """Hoja cruda -> DataFrame de bloques [ficha, dia, inicio, fin], o None."""
+    encabezado = ubicar_encabezado(df_h)
+    if encabezado is None:
+        return None
+    hora_col, start_row, grupo_cols = encabezado
+    day_cols = sorted(grupo_cols)[:len(DIAS_NOM)]
+    cuerpo = df_h.iloc[start_row:]
+    return bloques_desde_columnas(cuerpo.iloc[:, hora_col].to_numpy(), cuerpo.iloc[:, day_cols].to_numpy())
+
+
+def bloques_desde_columnas(col_hora, celdas_dia):
+    """Columna HORA (n,) y celdas de los días (n, d) -> DataFrame de bloques."""
+    horas = pd.Series(col_hora, dtype=object).astype(str).str.extract(PATRON_HORA)
+    validas = horas[0].notna().to_numpy()
+    inicio = horas[0].to_numpy(dtype=object)[validas]
+    fin = horas[1].to_numpy(dtype=object)[validas]
+    n = len(inicio)
+    n_dias = celdas_dia.shape[1]
+
+    # Fichas de todos los días en orden día-mayor (L completo, luego M...)
+    celdas = pd.Series(celdas_dia[validas].T.ravel(), dtype=object).astype(str)
+    celdas = celdas.str.strip().str.replace(r'(?s)\..*', '', regex=True)
+    es_ficha = (celdas.str.isdigit() & (celdas.str.len() > 3)).fillna(False).to_numpy(dtype=bool)
+    ficha = celdas.to_numpy(dtype=object)
+    dia = np.repeat(np.arange(n_dias), n)
+    inicio, fin = np.tile(inicio, n_dias), np.tile(fin, n_dias)
+
+    # Un tramo continúa la fila anterior (shift de 1) si coinciden el día,
+    # la ficha y el empalme de horas; si no, esa fila abre un bloque nuevo.
+    sigue = np.zeros(len(ficha), dtype=bool)
+    sigue[1:] = (es_ficha[1:] & es_ficha[:-1] & (dia[1:] == dia[:-1])
+                 & (ficha[1:] == ficha[:-1]) & (inicio[1:] == fin[:-1]))
+    abre = es_ficha & ~sigue
+    cierra = es_ficha & ~np.append(sigue[1:], False)
+    ini_idx, fin_idx = np.flatnonzero(abre), np.flatnonzero(cierra)
+
+    return pd.DataFrame({
+        'ficha': ficha[ini_idx],
+        'dia': np.asarray(DIAS_NOM, dtype=object)[dia[ini_idx]],
+        'inicio': inicio[ini_idx],
+        'fin': fin[fin_idx],
+    })
+
+
+def extraer_bloques(df_h):
+    """Recorre la hoja (sin encabezado) y devuelve los bloques ficha/día/hora."""
+    bloques = tabla_bloques(df_h)
+    if bloques is None:
+        return None
+    columnas = [bloques[c].to_list() for c in ('ficha', 'dia', 'inicio', 'fin')]
+    return [{'ficha': f, 'dia': d, 'inicio': i, 'fin': e} for f, d, i, e in zip(*columnas)]
+
+
+def agrupar_bloques(bloques):
+    """Agrupa los bloques por (ficha, inicio, fin) con la lista de días."""
+    if isinstance(bloques, pd.DataFrame):
+        grupos = bloques.groupby(['ficha', 'inicio', 'fin'], sort=False)['dia'].agg(list)
+        return dict(zip(grupos.index, grupos.to_list()))
+    agrupados = {}
+    for b in bloques:
+        k = (b['ficha'], b['inicio'], b['fin'])
+        if k not in agrupados: agrupados[k] = []
+        agrupados[k].append(b['dia'])
+    return agrupados
+
+
+def filas_desde_agrupados(agrupados, competencia_defecto="OTRA (Escribir manualmente)"):
+    """Convierte los bloques agrupados en filas de Formación Directa."""
+    filas = []
+    for (f, i, fn), d_list in agrupados.items():
+        filas.append({
+            "ficha": f, "h_inicio": datetime.strptime(i, "%H:%M").time(), "h_fin": datetime.strptime(fn, "%H:%M").time(),
+            "dias": {d: (d in d_list) for d in DIAS_NOM},
+            "competencia": competencia_defecto, "rap": "", "horas": 0, "evaluado": "NO", "termino": "NO"
+        })
+    return filas
+
+
+def filas_desde_hoja(df_h, competencia_defecto="OTRA (Escribir manualmente)"):
+    """Hoja cruda -> filas. Devuelve None si no se reconoce el formato."""
+    bloques = tabla_bloques(df_h)
+    if bloques is None:
+        return None
+    return filas_desde_agrupados(agrupar_bloques(bloques), competencia_defecto)
+
+
+def agrupados_excelfile(archivo):
+    """Ruta clásica: pd.ExcelFile + hoja completa en un DataFrame (sirve para .xls)."""
+    xls = pd.ExcelFile(archivo)
+    hoja = buscar_hoja(xls.sheet_names)
+    if not hoja:
+        return None
+    bloques = tabla_bloques(pd.read_excel(xls, sheet_name=hoja, header=None))
+    return None if bloques is None else agrupar_bloques(bloques)
+
+
+def leer_horario_excelfile(archivo, competencia_defecto="OTRA (Escribir manualmente)"):
+    agrupados = agrupados_excelfile(archivo)
+    return None if agrupados is None else filas_desde_agrupados(agrupados, competencia_defecto)
+
+
+# ==========================================
+# LECTURA EN STREAMING (openpyxl read_only)
+# ==========================================
+def bloques_de_hoja_streaming(ws):
+    """Lee una hoja read_only fila a fila guardando solo HORA y los GRUPO."""
+    # Algunos exportadores escriben una dimensión falsa (A1:A1); se ignora
+    ws.reset_dimensions()
+    cabecera = list(ws.iter_rows(max_row=FILAS_ENCABEZADO, values_only=True))
+    encabezado = ubicar_encabezado(pd.DataFrame(cabecera)) if cabecera else None
+    if encabezado is None:
+        return None
+    hora_col, start_row, grupo_cols = encabezado
+    day_cols = sorted(grupo_cols)[:len(DIAS_NOM)]
+    columnas = [hora_col] + day_cols
+    ancho = max(columnas) + 1
+
+    valores = []
+    for fila in ws.iter_rows(min_row=start_row + 1, max_col=ancho, values_only=True):
+        if len(fila) < ancho:
+            fila = fila + (None,) * (ancho - len(fila))
+        valores.append([fila[c] for c in columnas])
+    if not valores:
+        return bloques_desde_columnas(np.empty(0, dtype=object), np.empty((0, len(day_cols)), dtype=object))
+    matriz = np.array(valores, dtype=object)
+    return bloques_desde_columnas(matriz[:, 0], matriz[:, 1:])
+
+
+def abrir_libro(archivo):
+    """Libro openpyxl en modo read_only (no carga hojas hasta iterarlas)."""
+    import openpyxl  # diferido: solo se carga al leer un horario
+    return openpyxl.load_workbook(archivo, read_only=True, data_only=True)
+
+
+def agrupados_streaming(archivo):
+    """Abre el libro en read_only, ubica HORARIOINSTRUCTOR por nombre y lo recorre."""
+    wb = abrir_libro(archivo)
+    try:
+        hoja = buscar_hoja(wb.sheetnames)
+        if not hoja:
+            return None
+        bloques = bloques_de_hoja_streaming(wb[hoja])
+    finally:
+        wb.close()
+    return None if bloques is None else agrupar_bloques(bloques)
+
+
+def leer_horario_streaming(archivo, competencia_defecto="OTRA (Escribir manualmente)"):
+    agrupados = agrupados_streaming(archivo)
+    return None if agrupados is None else filas_desde_agrupados(agrupados, competencia_defecto)
+
+
+@medido("horario.parseo")
+def agrupados_de_libro(archivo):
+    """Streaming y, para los .xls que openpyxl no abre, la ruta de pandas."""
+    from openpyxl.utils.exceptions import InvalidFileException
+    try:
+        return agrupados_streaming(archivo)
+    except (zipfile.BadZipFile, InvalidFileException):
+        if hasattr(archivo, 'seek'):
+            archivo.seek(0)
+        return agrupados_excelfile(archivo)
+
+
+def _agrupados_por_hoja(archivo):
+    wb = abrir_libro(archivo)
+    try:
+        resultado = []
+        for hoja in wb.sheetnames:
+            bloques = bloques_de_hoja_streaming(wb[hoja])
+            if bloques is not None and len(bloques):
+                resultado.append((hoja, agrupar_bloques(bloques)))
+        return resultado
+    finally:
+        wb.close()
+
+
+def horarios_de_libro(archivo, competencia_defecto="OTRA (Escribir manualmente)", cache=None):
+    """Lista de (hoja, filas) para cada hoja con horario de un libro multi-hoja."""
+    if cache is None:
+        por_hoja = _agrupados_por_hoja(archivo)
+    else:
+        contenido = leer_bytes(archivo)
+        por_hoja = cache.obtener_o_calcular(huella(contenido, VERSION_LECTOR, "libro"),
+                                            lambda: _agrupados_por_hoja(BytesIO(contenido)))
+    return [(hoja, filas_desde_agrupados(agrupados, competencia_defecto)) for hoja, agrupados in por_hoja]
+
+
+@medido("horario.lectura")
+def leer_horario(archivo, competencia_defecto="OTRA (Escribir manualmente)", cache=None):
+    """Lee un libro subido/ruta y devuelve las filas, o None si no hay horario.
+
+    Con una CacheLRU, el resultado se memoriza por el hash del archivo
+    y la versión del lector, así que una re-subida no vuelve a decodificar
+    el Excel. Las filas se construyen siempre nuevas porque la interfaz las
+    modifica en sitio.
+    """
+    if cache is None:
+        agrupados = agrupados_de_libro(archivo)
+    else:
+        contenido = leer_bytes(archivo)
+        agrupados = cache.obtener_o_calcular(huella(contenido, VERSION_LECTOR),
+                                             lambda: agrupados_de_libro(BytesIO(contenido)))
+    return None if agrupados is None else filas_desde_agrupados(agrupados, competencia_defecto)
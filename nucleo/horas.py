@@ -0,0 +1,180 @@
+import calendar
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from nucleo.festivos import festivos_mes
+from nucleo.medicion import medido
+
+# ==========================================
+# CÁLCULO DE HORAS DEL MES
+# ==========================================
+# Una vez por mes se cuentan las ocurrencias de cada día de la semana y se
+# arma la máscara de bits de las novedades (bit d-1 = día d del mes). Con
+# eso las horas de una ficha son una consulta: días netos según los días
+# marcados x horas por día, sin recorrer la lista de fechas del mes. Los
+# festivos (nucleo.festivos, calculados una vez por año) se suman a las
+# novedades con festivos=True.
+MESES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+MAPA_DIAS = {"L": 0, "M": 1, "Mi": 2, "J": 3, "V": 4, "S": 5}
+
+
+@lru_cache(maxsize=32)
+def dias_del_mes(anio, mes):
+    """Tupla de fechas del mes (mes 1-12)."""
+    return tuple(date(anio, mes, d) for d in range(1, calendar.monthrange(anio, mes)[1] + 1))
+
+
+def _microsegundos(h):
+    return ((h.hour * 60 + h.minute) * 60 + h.second) * 1_000_000 + h.microsecond
+
+
+def horas_por_dia(h_inicio, h_fin):
+    """Horas entre inicio y fin; si fin < inicio cruza la medianoche.
+
+    Equivale a (datetime.combine(hoy, fin) - datetime.combine(hoy, inicio)).seconds / 3600.
+    """
+    return ((_microsegundos(h_fin) - _microsegundos(h_inicio)) // 1_000_000 % 86400) / 3600
+
+
+def mascara_dias(dias):
+    """{"L": True, ...} -> entero de 6 bits (bit 0 = lunes)."""
+    m = 0
+    for d, activo in dias.items():
+        if activo:
+            m |= 1 << MAPA_DIAS[d]
+    return m
+
+
+class CalendarioMes:
+    """Conteos precalculados de un mes con sus novedades globales."""
+
+    def __init__(self, anio, mes, novedades=()):
+        self.anio, self.mes = anio, mes
+        primer_dia, self.n_dias = calendar.monthrange(anio, mes)
+        dia_semana = (primer_dia + np.arange(self.n_dias)) % 7
+
+        self.mascara_novedades = 0
+        for f in novedades:
+            if f.year == anio and f.month == mes:
+                self.mascara_novedades |= 1 << (f.day - 1)
+        con_novedad = np.array([(self.mascara_novedades >> d) & 1 for d in range(self.n_dias)], dtype=bool)
+
+        self.ocurrencias = np.bincount(dia_semana, minlength=7)
+        self.descuentos = np.bincount(dia_semana[con_novedad], minlength=7)
+        self.netos = self.ocurrencias - self.descuentos
+
+        # Tablas por máscara de días (64 combinaciones de L..S)
+        bits = (np.arange(64)[:, None] >> np.arange(6)) & 1
+        self._netos_por_mascara = (bits @ self.netos[:6]).tolist()
+        self._descuentos_por_mascara = (bits @ self.descuentos[:6]).tolist()
+
+    def dias_laborados(self, dias):
+        return self._netos_por_mascara[mascara_dias(dias)]
+
+    def dias_descontados(self, dias):
+        return self._descuentos_por_mascara[mascara_dias(dias)]
+
+    def horas_fila(self, fila):
+        """Horas del mes de una ficha descontando las novedades globales."""
+        return self.dias_laborados(fila['dias']) * horas_por_dia(fila['h_inicio'], fila['h_fin'])
+
+
+@lru_cache(maxsize=64)
+@medido("horas.calendario")
+def _calendario(anio, mes, novedades):
+    return CalendarioMes(anio, mes, novedades)
+
+
+def calendario_mes(anio, mes, novedades=(), festivos=False):
+    """CalendarioMes compartido por (año, mes, novedades del mes).
+
+    festivos=True descuenta además los festivos nacionales del mes.
+    """
+    del_mes = {f for f in novedades if f.year == anio and f.month == mes}
+    if festivos:
+        del_mes.update(festivos_mes(anio, mes))
+    return _calendario(anio, mes, tuple(sorted(del_mes)))
+
+
+def meses_rango(desde, hasta):
+    """[(año, mes)] de los meses completos entre dos fechas (incluidos ambos extremos)."""
+    meses = []
+    anio, mes = desde.year, desde.month
+    while (anio, mes) <= (hasta.year, hasta.month):
+        meses.append((anio, mes))
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return meses
+
+
+def calendarios_rango(desde, hasta, novedades=(), festivos=True):
+    """Un CalendarioMes por mes del rango (reportes anuales, lotes de varios meses)."""
+    return [calendario_mes(anio, mes, novedades, festivos) for anio, mes in meses_rango(desde, hasta)]
+
+
+def bloques_hrs_mes(filas):
+    """Bloques de filas contiguas de la misma ficha (columna HRS MES del reporte).
+
+    Devuelve [(primera, última, horas de la ficha)] con índices de `filas`. Las
+    horas son las de la ficha en todo el mes, aunque esté en bloques separados;
+    se muestran en la primera fila de cada bloque y el bloque se fusiona.
+    """
+    horas_ficha = {}
+    for f in filas:
+        horas_ficha[f['ficha']] = horas_ficha.get(f['ficha'], 0) + f['horas']
+    bloques = []
+    for i, f in enumerate(filas):
+        if i and f['ficha'] == filas[i - 1]['ficha']:
+            bloques[-1] = (bloques[-1][0], i, bloques[-1][2])
+        else:
+            bloques.append((i, i, horas_ficha[f['ficha']]))
+    return bloques
+
+
+# ==========================================
+# CÁLCULO POR LOTES (NumPy)
+# ==========================================
+def matriz_filas(filas):
+    """Filas -> (días marcados (n, 6) bool, horas por día (n,))."""
+    dias = np.array([[f['dias'].get(d, False) for d in MAPA_DIAS] for f in filas], dtype=bool).reshape(-1, 6)
+    inicio = np.array([_microsegundos(f['h_inicio']) for f in filas], dtype=np.int64)
+    fin = np.array([_microsegundos(f['h_fin']) for f in filas], dtype=np.int64)
+    h_dia = ((fin - inicio) // 1_000_000 % 86400) / 3600
+    return dias, h_dia
+
+
+def horas_lote(dias, h_dia, netos):
+    """Horas de muchas fichas a la vez.
+
+    dias: (n, 6) bool; h_dia: (n,); netos: (7,) de un único calendario o
+    (n, 7) con el calendario de cada fila (varios instructores o meses).
+    """
+    netos = np.asarray(netos)[..., :6]
+    return (np.asarray(dias, dtype=bool) * netos).sum(axis=-1) * np.asarray(h_dia, dtype=float)
+
+
+@medido("horas.rango")
+def horas_por_mes(filas, calendarios):
+    """Matriz (fichas x meses) de horas con un calendario por mes (ver calendarios_rango).
+
+    Los días netos de todos los meses se apilan en una matriz (meses, 6): una
+    sola multiplicación para todas las fichas, sin recalcular nada por ficha.
+    """
+    if not filas or not calendarios:
+        return np.zeros((len(filas), len(calendarios)))
+    dias, h_dia = matriz_filas(filas)
+    netos = np.array([c.netos[:6] for c in calendarios])
+    return (dias.astype(np.int64) @ netos.T) * h_dia[:, None]
+
+
+@medido("horas.calculo")
+def calcular_horas(filas, calendario):
+    """Escribe fila['horas'] en todas las filas y devuelve el total."""
+    if not filas:
+        return 0
+    dias, h_dia = matriz_filas(filas)
+    horas = horas_lote(dias, h_dia, calendario.netos)
+    for fila, h in zip(filas, horas.tolist()):
+        fila['horas'] = h
+    return sum(f['horas'] for f in filas)
@@ -0,0 +1,205 @@
+"""Generación por lotes de reportes PDF para todo el centro.
+
+Uso:
+    python -m nucleo.lote HORARIOS/ --mes Marzo --anio 2026 \\
+        --novedades 2026-03-23,2026-03-24 --salida reportes_marzo.zip \\
+        [--consolidado consolidado_marzo.pdf] [--excel centro_marzo.xlsx]
+
+La entrada puede ser una carpeta con un libro por instructor (se usa la
+hoja HORARIOINSTRUCTOR de cada uno) o un libro con una hoja por instructor.
+El nombre del instructor sale del nombre del archivo u hoja; un CSV
+opcional (--instructores) con columnas id,nombre,cedula lo sobreescribe.
+--consolidado escribe además un solo PDF con todos los instructores y una
+página de resumen (ver nucleo.consolidado) y --excel un libro .xlsx con una
+hoja por instructor (ver nucleo.excel). Los festivos nacionales del mes se
+descuentan solos (nucleo.festivos); --sin-festivos lo desactiva.
+"""
+import argparse
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import pandas as pd
+
+from nucleo import medicion
+from nucleo.cache import CacheLRU
+from nucleo.festivos import festivos_mes
+from nucleo.horario import horarios_de_libro, leer_horario
+from nucleo.horas import MESES, calcular_horas, calendario_mes
+from nucleo.pdf import crear_pdf, obtener_plantilla
+
+
+# ==========================================
+# LECTURA DE LA ENTRADA
+# ==========================================
+def leer_horarios(entrada, cache=None):
+    """Devuelve [(id, filas)] de una carpeta de libros o de un libro multi-hoja."""
+    horarios = []
+    if os.path.isdir(entrada):
+        for nombre in sorted(os.listdir(entrada)):
+            if not nombre.lower().endswith(('.xlsx', '.xls')) or nombre.startswith('~$'):
+                continue
+            filas = leer_horario(os.path.join(entrada, nombre), cache=cache)
+            if filas:
+                horarios.append((os.path.splitext(nombre)[0], filas))
+    else:
+        horarios.extend(horarios_de_libro(entrada, cache=cache))
+    return horarios
+
+
+def leer_instructores(ruta):
+    """CSV id,nombre,cedula -> {id: (nombre, cedula)}."""
+    if not ruta:
+        return {}
+    df = pd.read_csv(ruta, dtype=str).fillna("")
+    return {fila['id'].strip(): (fila['nombre'].strip(), fila['cedula'].strip()) for _, fila in df.iterrows()}
+
+
+# ==========================================
+# TRABAJO DE CADA PROCESO
+# ==========================================
+def renderizar_reporte(ident, nombre, cedula, mes, anio, filas, novedades):
+    """Calcula horas y genera el PDF de un instructor. Devuelve (id, pdf, segundos)."""
+    t0 = time.perf_counter()
+    total_dir = calcular_horas(filas, calendario_mes(int(anio), MESES.index(mes) + 1, novedades))
+    pdf = crear_pdf(nombre, cedula, mes, anio, filas, [], total_dir, 0, total_dir, novedades)
+    return ident, pdf, time.perf_counter() - t0
+
+
+def generar_lote(horarios, mes, anio, novedades=(), instructores=None, salida="reportes", workers=None):
+    """Renderiza todos los horarios en un pool de procesos y escribe ZIP o carpeta.
+
+    Devuelve un dict con el tiempo por reporte, el rendimiento global y los
+    reportes que fallaron (id -> error); un reporte con error no detiene el lote.
+    """
+    instructores = instructores or {}
+    novedades = sorted(novedades)
+    es_zip = salida.lower().endswith('.zip')
+    if not es_zip:
+        os.makedirs(salida, exist_ok=True)
+
+    tiempos = {}
+    fallidos = {}
+    t0 = time.perf_counter()
+    destino = zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED) if es_zip else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=obtener_plantilla) as pool:
+            futuros = {}
+            for ident, filas in horarios:
+                nombre, cedula = instructores.get(ident, (ident, ""))
+                futuros[pool.submit(renderizar_reporte, ident, nombre, cedula, mes, anio, filas, novedades)] = ident
+            for fut in as_completed(futuros):
+                try:
+                    ident, pdf, seg = fut.result()
+                except Exception as e:
+                    fallidos[futuros[fut]] = f"{type(e).__name__}: {e}"
+                    continue
+                archivo = f"Reporte_{ident}_{mes}.pdf"
+                if destino:
+                    destino.writestr(archivo, pdf)
+                else:
+                    with open(os.path.join(salida, archivo), 'wb') as fh:
+                        fh.write(pdf)
+                tiempos[ident] = seg
+    finally:
+        if destino:
+            destino.close()
+    total = time.perf_counter() - t0
+
+    return {
+        "reportes": len(tiempos),
+        "segundos_total": total,
+        "reportes_por_segundo": len(tiempos) / total if total else 0.0,
+        "segundos_por_reporte": tiempos,
+        "fallidos": fallidos,
+    }
+
+
+def reportes_consolidado(horarios, mes, anio, novedades=(), instructores=None):
+    """Argumentos de crear_pdf de cada instructor, calculados a medida que se piden."""
+    instructores = instructores or {}
+    novedades = sorted(novedades)
+    cal = calendario_mes(int(anio), MESES.index(mes) + 1, novedades)
+    for ident, filas in horarios:
+        nombre, cedula = instructores.get(ident, (ident, ""))
+        total_dir = calcular_horas(filas, cal)
+        yield (nombre, cedula, mes, anio, filas, [], total_dir, 0, total_dir, novedades)
+
+
+# ==========================================
+# LÍNEA DE COMANDOS
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los reportes PDF de todos los instructores.")
+    parser.add_argument("entrada", help="Carpeta de libros HORARIOINSTRUCTOR o libro con una hoja por instructor")
+    parser.add_argument("--mes", required=True, choices=MESES)
+    parser.add_argument("--anio", required=True)
+    parser.add_argument("--novedades", default="", help="Fechas AAAA-MM-DD separadas por coma (permisos, jornadas...); los festivos se agregan solos")
+    parser.add_argument("--sin-festivos", action="store_true", help="No descontar los festivos nacionales del mes")
+    parser.add_argument("--instructores", help="CSV con columnas id,nombre,cedula")
+    parser.add_argument("--salida", default="reportes", help="Carpeta de salida o archivo .zip")
+    parser.add_argument("--consolidado", help="Ruta .pdf del reporte consolidado del centro (opcional)")
+    parser.add_argument("--excel", help="Ruta .xlsx con una hoja por instructor y una de resumen (opcional)")
+    parser.add_argument("--cache", help="Carpeta de caché de horarios leídos (reutilizada entre corridas)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, núcleos de la CPU)")
+    args = parser.parse_args(argv)
+
+    novedades = {date.fromisoformat(n.strip()) for n in args.novedades.split(",") if n.strip()}
+    if not args.sin_festivos:
+        novedades.update(festivos_mes(int(args.anio), MESES.index(args.mes) + 1))
+    novedades = sorted(novedades)
+
+    t0 = time.perf_counter()
+    cache = CacheLRU(directorio=args.cache) if args.cache else None
+    horarios = leer_horarios(args.entrada, cache)
+    t_lectura = time.perf_counter() - t0
+    if not horarios:
+        print("No se encontraron horarios en la entrada.", file=sys.stderr)
+        return 1
+
+    res = generar_lote(horarios, args.mes, args.anio, novedades, leer_instructores(args.instructores), args.salida, args.workers)
+
+    for ident, seg in sorted(res["segundos_por_reporte"].items()):
+        print(f"{ident}: {seg * 1000:.0f} ms")
+    print(f"Lectura de horarios: {t_lectura:.2f} s ({len(horarios)} horarios)")
+    print(f"Novedades aplicadas: {', '.join(n.strftime('%d/%m') for n in novedades) or 'ninguna'}")
+    if cache:
+        est = cache.estadisticas()
+        print(f"Caché: {est['aciertos_memoria'] + est['aciertos_disco']} aciertos, {est['fallos']} fallos")
+    print(f"Render: {res['reportes']} reportes en {res['segundos_total']:.2f} s "
+          f"({res['reportes_por_segundo']:.1f} reportes/s)")
+    print(f"Salida: {args.salida}")
+    for ident, error in sorted(res["fallidos"].items()):
+        print(f"ERROR {ident}: {error}", file=sys.stderr)
+    if res["fallidos"]:
+        print(f"{len(res['fallidos'])} reporte(s) no se generaron.", file=sys.stderr)
+
+    if args.consolidado:
+        from nucleo.consolidado import generar_consolidado
+
+        t0 = time.perf_counter()
+        con = generar_consolidado(
+            reportes_consolidado(horarios, args.mes, args.anio, novedades, leer_instructores(args.instructores)),
+            args.consolidado, titulo=f"RESUMEN DEL CENTRO - {args.mes.upper()} {args.anio}")
+        print(f"Consolidado: {con['instructores']} instructores, {con['paginas']} páginas en "
+              f"{time.perf_counter() - t0:.2f} s -> {args.consolidado}")
+    if args.excel:
+        from nucleo.excel import generar_libro_centro
+
+        t0 = time.perf_counter()
+        libro = generar_libro_centro(
+            reportes_consolidado(horarios, args.mes, args.anio, novedades, leer_instructores(args.instructores)),
+            args.excel, titulo=f"RESUMEN DEL CENTRO - {args.mes.upper()} {args.anio}")
+        print(f"Excel: {libro['instructores']} instructores, {libro['filas']} filas en "
+              f"{time.perf_counter() - t0:.2f} s -> {args.excel}")
+    return 1 if res["fallidos"] else 0
+
+
+if __name__ == "__main__":
+    # REPORTE_PERFIL=cprofile|pyinstrument perfila el proceso principal
+    with medicion.corrida("lote"):
+        codigo = main()
+    sys.exit(codigo)
@@ -0,0 +1,199 @@
+import contextvars
+import cProfile
+import functools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# ==========================================
+# MEDICIÓN POR ETAPAS
+# ==========================================
+# Cronómetros y contadores livianos alrededor de cada etapa (lectura del
+# Excel, horas, catálogo, armado y build del PDF). Todo se acumula en el total
+# del proceso y, si hay una corrida activa en el hilo (un rerun de la app, un
+# lote), también en ella: así el panel de depuración muestra el desglose del
+# último rerun. REPORTE_PERFIL=cprofile|pyinstrument perfila cada corrida y
+# deja el resultado en REPORTE_PERFIL_DIR (por defecto ./perfiles).
+log = logging.getLogger(__name__)
+
+
+class Medidor:
+    """Tiempos (llamadas, total, máximo) por etapa y contadores sueltos."""
+
+    def __init__(self, nombre=""):
+        self.nombre = nombre
+        self.etapas = {}
+        self.contadores = defaultdict(int)
+        self.inicio = time.perf_counter()
+        self.fin = None
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa, seg):
+        with self._lock:
+            e = self.etapas.setdefault(etapa, [0, 0.0, 0.0])
+            e[0] += 1
+            e[1] += seg
+            e[2] = max(e[2], seg)
+
+    def contar(self, nombre, n=1):
+        with self._lock:
+            self.contadores[nombre] += n
+
+    def resumen(self):
+        """[{etapa, llamadas, total_ms, max_ms}] de la etapa más cara a la más barata."""
+        with self._lock:
+            filas = [{"etapa": k, "llamadas": n, "total_ms": seg * 1000, "max_ms": mx * 1000}
+                     for k, (n, seg, mx) in self.etapas.items()]
+        return sorted(filas, key=lambda f: f["total_ms"], reverse=True)
+
+    def sumar(self, resumen):
+        """Acumula el resumen() de otro Medidor (p. ej. el de un proceso de render)."""
+        with self._lock:
+            for f in resumen:
+                e = self.etapas.setdefault(f["etapa"], [0, 0.0, 0.0])
+                e[0] += f["llamadas"]
+                e[1] += f["total_ms"] / 1000
+                e[2] = max(e[2], f["max_ms"] / 1000)
+
+    def como_dict(self):
+        fin = self.fin if self.fin is not None else time.perf_counter()
+        return {"nombre": self.nombre, "total_ms": (fin - self.inicio) * 1000,
+                "etapas": self.resumen(), "contadores": dict(self.contadores)}
+
+
+TOTAL = Medidor("proceso")
+_corrida = contextvars.ContextVar("corrida", default=None)
+
+
+def corrida_actual():
+    c = _corrida.get()
+    return None if c is None else c.medidor
+
+
+@contextmanager
+def etapa(nombre):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        seg = time.perf_counter() - t0
+        TOTAL.registrar(nombre, seg)
+        actual = corrida_actual()
+        if actual is not None:
+            actual.registrar(nombre, seg)
+
+
+def medido(nombre):
+    """Decorador: mide cada llamada a la función como la etapa `nombre`."""
+    def decorador(fn):
+        @functools.wraps(fn)
+        def envoltura(*args, **kwargs):
+            with etapa(nombre):
+                return fn(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def contar(nombre, n=1):
+    TOTAL.contar(nombre, n)
+    actual = corrida_actual()
+    if actual is not None:
+        actual.contar(nombre, n)
+
+
+# ==========================================
+# CORRIDAS Y PERFILADOR OPCIONAL
+# ==========================================
+class Perfilador:
+    """cProfile o pyinstrument según REPORTE_PERFIL; no hace nada si está vacía."""
+
+    def __init__(self, nombre):
+        self.modo = os.environ.get("REPORTE_PERFIL", "").strip().lower()
+        self.nombre = nombre
+        self._perfil = None
+        if self.modo == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                log.warning("pyinstrument no está instalado; se usa cProfile")
+                self.modo = "cprofile"
+            else:
+                self._perfil = Profiler()
+        if self.modo == "cprofile":
+            self._perfil = cProfile.Profile()
+        elif self.modo and self._perfil is None:
+            log.warning("REPORTE_PERFIL=%s no reconocido (cprofile|pyinstrument)", self.modo)
+
+    def iniciar(self):
+        if self.modo == "cprofile":
+            self._perfil.enable()
+        elif self._perfil is not None:
+            self._perfil.start()
+
+    def terminar(self):
+        """Detiene el perfilador y devuelve la ruta del archivo escrito (o None)."""
+        if self._perfil is None:
+            return None
+        directorio = os.environ.get("REPORTE_PERFIL_DIR", "perfiles")
+        os.makedirs(directorio, exist_ok=True)
+        base = os.path.join(directorio, f"{self.nombre}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{threading.get_ident()}")
+        if self.modo == "cprofile":
+            self._perfil.disable()
+            ruta = base + ".prof"
+            self._perfil.dump_stats(ruta)
+        else:
+            self._perfil.stop()
+            ruta = base + ".html"
+            with open(ruta, "w", encoding="utf-8") as fh:
+                fh.write(self._perfil.output_html())
+        self._perfil = None
+        return ruta
+
+
+class Corrida:
+    """Un rerun o un lote: su propio Medidor y, si se pidió, su perfil."""
+
+    def __init__(self, nombre):
+        self.medidor = Medidor(nombre)
+        self.perfilador = Perfilador(nombre)
+        self.terminada = False
+
+    def terminar(self):
+        if not self.terminada:
+            self.terminada = True
+            self.medidor.fin = time.perf_counter()
+            self.perfilador.terminar()
+        return self.medidor
+
+
+def iniciar_corrida(nombre):
+    """Abre una corrida en este hilo; cierra la anterior si quedó abierta.
+
+    Un rerun de Streamlit puede cortarse con st.rerun()/st.stop() antes de
+    llegar al final del script; la siguiente corrida la da por terminada.
+    """
+    anterior = _corrida.get()
+    if anterior is not None:
+        anterior.terminar()
+    c = Corrida(nombre)
+    _corrida.set(c)
+    c.perfilador.iniciar()
+    return c
+
+
+def terminar_corrida():
+    c = _corrida.get()
+    _corrida.set(None)
+    return None if c is None else c.terminar()
+
+
+@contextmanager
+def corrida(nombre):
+    c = iniciar_corrida(nombre)
+    try:
+        yield c.medidor
+    finally:
+        terminar_corrida()
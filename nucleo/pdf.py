@@ -0,0 +1,208 @@
+import os
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Flowable, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from nucleo.horas import bloques_hrs_mes
+from nucleo.medicion import etapa, medido
+
+RUTA_LOGO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logo_sena.png")
+
+# ==========================================
+# MOTOR DE EXPORTACIÓN A PDF
+# ==========================================
+class Logo(Flowable):
+    """Flowable que dibuja el logo con canvas.drawImage a partir de un ImageReader.
+
+    El ImageReader se arma una vez por plantilla y guarda el PNG ya
+    decodificado, así cada reporte no vuelve a leer ni decodificar el archivo.
+    """
+
+    def __init__(self, imagen, ancho, alto):
+        Flowable.__init__(self)
+        self.imagen = imagen
+        self.drawWidth, self.drawHeight = ancho, alto
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        self.canv.drawImage(self.imagen, 0, 0, self.drawWidth, self.drawHeight, mask='auto')
+
+
+def leer_logo(ruta):
+    """ImageReader del logo con los píxeles ya decodificados."""
+    with open(ruta, 'rb') as fh:
+        imagen = ImageReader(BytesIO(fh.read()))
+    imagen.getRGBData()  # decodifica aquí y no en el primer reporte
+    return imagen
+
+
+class PlantillaReporte:
+    """Estilos, logo y estilos de tabla fijos del reporte, armados una vez.
+
+    Una misma plantilla genera muchos reportes (modo por lotes, app); usar
+    obtener_plantilla() para compartir una por proceso.
+    """
+    COL_DIRECTA = [45, 35, 35, 15, 15, 15, 15, 15, 15, 180, 190, 30, 30, 25, 35]
+    COL_OTRAS = [250, 110, 110, 100, 80]
+
+    def __init__(self, ruta_logo=RUTA_LOGO):
+        styles = getSampleStyleSheet()
+        self.style_normal = styles['Normal']
+        self.style_center = ParagraphStyle(name='Center', parent=styles['Normal'], alignment=1, fontSize=11, leading=14)
+        self.style_title = ParagraphStyle(name='Title', parent=styles['Heading1'], alignment=1, fontSize=14, spaceAfter=12)
+        self.style_cell = ParagraphStyle(name='Cell', parent=styles['Normal'], fontSize=8, leading=10)
+        self.style_subtitle = ParagraphStyle(name='Sub', parent=styles['Normal'], fontSize=10, fontName='Helvetica-Bold', spaceAfter=6, spaceBefore=10)
+        self.logo = leer_logo(ruta_logo) if ruta_logo and os.path.exists(ruta_logo) else None
+
+        self.estilos_directa = (
+            ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('GRID', (0,0), (-1,-1), 0.5, colors.black),
+            ('FONTSIZE', (0,0), (-1,-1), 8),
+            ('BACKGROUND', (-1,1), (-1,-2), colors.Color(0.93, 0.97, 1.0)),
+            ('FONTNAME', (-1,0), (-1,0), 'Helvetica-Bold'),
+        )
+        self.estilo_otras = TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 0.5, colors.black), ('ALIGN', (0,0), (-1,-1), 'CENTER')])
+
+    def crear_pdf(self, nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30)
+        with etapa("pdf.elementos"):
+            elementos = self.elementos(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales)
+        with etapa("pdf.build"):
+            doc.build(elementos)
+        return buffer.getvalue()
+
+    def elementos(self, nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+        """Flowables del reporte de un instructor."""
+        elements = []
+    
+        if self.logo:
+            elements.append(Logo(self.logo, 0.7*inch, 0.7*inch))
+    
+        elements.append(Paragraph("<b>CENTRO INDUSTRIAL Y DE ENERGIAS ALTERNATIVAS - REGIONAL GUAJIRA</b>", self.style_center))
+        elements.append(Paragraph("<b>REPORTE ESTADISTICO DE HORAS MENSUALES INSTRUCTOR</b>", self.style_title))
+    
+        info_text = f"<b>INSTRUCTOR:</b> {nombre} &nbsp;&nbsp;&nbsp;&nbsp; <b>CÉDULA:</b> {cedula} &nbsp;&nbsp;&nbsp;&nbsp; <b>MES:</b> {mes} / {anio}"
+        elements.append(Paragraph(info_text, self.style_normal))
+    
+        # 1. TABLA DIRECTA — con columna HRS MES fusionada por bloque contiguo de ficha
+        elements.append(Paragraph("PARTE HORAS DIRECTAS - PROGRAMAS EN FORMACIÓN TITULADA", self.style_subtitle))
+        data_table = [["FICHA", "DESDE", "HASTA", "L", "M", "MI", "J", "V", "S", "COMPETENCIA", "RAP", "EVAL", "TERM", "HRS", "HRS MES"]]
+        bloques = bloques_hrs_mes(datos_formacion)
+        hrs_mes = {primera: horas for primera, _, horas in bloques}  # índice de fila -> total de la ficha
+    
+        for idx_f, f in enumerate(datos_formacion):
+            valor_hrs_mes = f"{hrs_mes[idx_f]:g}" if idx_f in hrs_mes else ""
+        
+            row = [
+                f['ficha'],
+                f['h_inicio'].strftime("%H:%M"),
+                f['h_fin'].strftime("%H:%M"),
+                "X" if f['dias']["L"] else "",
+                "X" if f['dias']["M"] else "",
+                "X" if f['dias']["Mi"] else "",
+                "X" if f['dias']["J"] else "",
+                "X" if f['dias']["V"] else "",
+                "X" if f['dias']["S"] else "",
+                Paragraph(f['competencia'], self.style_cell),
+                Paragraph(f['rap'], self.style_cell),
+                f.get('evaluado', 'NO'),
+                f.get('termino', 'NO'),
+                f"{f['horas']:g}",
+                valor_hrs_mes
+            ]
+            data_table.append(row)
+        data_table.append(["", "", "", "", "", "", "", "", "", "", "", "", "", "TOTAL:", f"{tot_dir:g}"])
+
+        # repeatRows: si la lista de fichas no cabe, el encabezado se repite en cada página
+        t_dir = Table(data_table, colWidths=self.COL_DIRECTA, repeatRows=1)
+    
+        # Estilos base (fijos) + fusiones propias de este reporte
+        estilos_tabla = list(self.estilos_directa)
+        
+        # Fusionar celdas HRS MES solo para filas CONTIGUAS de la misma ficha (+1: fila 0 es el header)
+        col_hrs_mes = 14  # índice de la columna HRS MES (0-based)
+        for primera, ultima, _ in bloques:
+            if ultima > primera:
+                estilos_tabla.append(('SPAN', (col_hrs_mes, primera + 1), (col_hrs_mes, ultima + 1)))
+                estilos_tabla.append(('FONTNAME', (col_hrs_mes, primera + 1), (col_hrs_mes, ultima + 1), 'Helvetica-Bold'))
+    
+        t_dir.setStyle(TableStyle(estilos_tabla))
+        elements.append(t_dir)
+    
+        if datos_otras:
+            elements.append(Spacer(1, 15))
+            elements.append(Paragraph("PARTE OTRAS ACTIVIDADES INSTRUCTORES PLANTA", self.style_subtitle))
+            data_otras = [["ACTIVIDAD", "FECHA DESDE", "FECHA HASTA", "CANT. DÍAS", "HRS"]]
+            for of in datos_otras:
+                data_otras.append([of['actividad'], of['f_desde'].strftime("%d/%m/%Y"), of['f_hasta'].strftime("%d/%m/%Y"), f"{of['dias']:g}", f"{of['horas']:g}"])
+            data_otras.append(["", "", "", "TOTAL OTRAS:", f"{tot_otr:g}"])
+            t_otras = Table(data_otras, colWidths=self.COL_OTRAS, repeatRows=1)
+            t_otras.setStyle(self.estilo_otras)
+            elements.append(t_otras)
+    
+        elements.append(Spacer(1, 20))
+        elements.append(Paragraph(f"<b>TOTAL HORAS REPORTADAS EN EL MES: &nbsp; {tot_gen:g} Horas</b>", self.style_center))
+
+        # --- NOVEDADES GLOBALES EN EL PDF ---
+        if novedades_globales:
+            elements.append(Spacer(1, 10))
+            nov_texto = ", ".join([n.strftime("%d/%m/%Y") for n in novedades_globales])
+            elements.append(Paragraph(f"<font color=red><b>Novedades/Festivos aplicados:</b></font> {nov_texto}", self.style_cell))
+    
+        fecha_gen = datetime.now().strftime("%d/%m/%Y %I:%M %p")
+        firma_html = f"<br/><br/><br/>_________________________________<br/><b>FIRMA DEL INSTRUCTOR</b><br/>{nombre}<br/>C.C. {cedula}<br/><br/><font size=8 color=gray>Reporte generado el: {fecha_gen}</font>"
+        elements.append(Paragraph(firma_html, self.style_center))
+    
+        return elements
+
+    COL_RESUMEN = [230, 90, 90, 60, 80, 80, 80]
+
+    def elementos_resumen(self, filas_resumen, titulo="RESUMEN DEL CENTRO"):
+        """Tabla de totales por instructor para el reporte consolidado.
+
+        filas_resumen: [(nombre, cedula, periodo, n_fichas, tot_dir, tot_otr, tot_gen)]
+        """
+        elements = []
+        if self.logo:
+            elements.append(Logo(self.logo, 0.7*inch, 0.7*inch))
+        elements.append(Paragraph("<b>CENTRO INDUSTRIAL Y DE ENERGIAS ALTERNATIVAS - REGIONAL GUAJIRA</b>", self.style_center))
+        elements.append(Paragraph(f"<b>{titulo}</b>", self.style_title))
+
+        data = [["INSTRUCTOR", "CÉDULA", "PERIODO", "FICHAS", "HRS DIRECTAS", "HRS OTRAS", "TOTAL"]]
+        suma_dir = suma_otr = suma_gen = 0
+        for nombre, cedula, periodo, n_fichas, tot_dir, tot_otr, tot_gen in filas_resumen:
+            data.append([Paragraph(str(nombre), self.style_cell), cedula, periodo, n_fichas, f"{tot_dir:g}", f"{tot_otr:g}", f"{tot_gen:g}"])
+            suma_dir, suma_otr, suma_gen = suma_dir + tot_dir, suma_otr + tot_otr, suma_gen + tot_gen
+        data.append([f"{len(filas_resumen)} instructores", "", "", "TOTAL:", f"{suma_dir:g}", f"{suma_otr:g}", f"{suma_gen:g}"])
+        t = Table(data, colWidths=self.COL_RESUMEN, repeatRows=1)
+        t.setStyle(TableStyle(list(self.estilos_directa[:5]) + [('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold')]))
+        elements.append(t)
+        fecha_gen = datetime.now().strftime("%d/%m/%Y %I:%M %p")
+        elements.append(Spacer(1, 10))
+        elements.append(Paragraph(f"<font size=8 color=gray>Reporte generado el: {fecha_gen}</font>", self.style_center))
+        return elements
+
+
+@lru_cache(maxsize=None)
+@medido("pdf.plantilla")
+def obtener_plantilla():
+    """Plantilla compartida por proceso (estilos y logo se arman una vez)."""
+    return PlantillaReporte()
+
+
+@medido("pdf.crear")
+def crear_pdf(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales=()):
+    return obtener_plantilla().crear_pdf(nombre, cedula, mes, anio, datos_formacion, datos_otras, tot_dir, tot_otr, tot_gen, novedades_globales)
@@ -0,0 +1,235 @@
+"""Pool de render compartido: PDF y Excel fuera del rerun de Streamlit.
+
+A fin de mes decenas de instructores generan su reporte al mismo tiempo.
+doc.build es CPU puro y, corriendo en los hilos del servidor, compite por el
+GIL con los reruns de todos. PoolRender lo manda a un número fijo de
+procesos (REPORTE_RENDER_WORKERS) con una cola acotada (REPORTE_RENDER_COLA):
+la app envía el pedido, sigue respondiendo y recoge los bytes cuando están
+listos. Dos pedidos con la misma clave (huella de los datos + formato)
+comparten un solo render. multiprocessing se importa al primer pedido, no
+al arrancar la app.
+"""
+import logging
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from nucleo import medicion
+from nucleo.cache import CacheLRU
+
+log = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get("REPORTE_RENDER_WORKERS", 0)) or max(1, min(4, (os.cpu_count() or 2) - 1))
+MAX_COLA = int(os.environ.get("REPORTE_RENDER_COLA", 64))
+
+
+# ==========================================
+# TRABAJO DE CADA PROCESO
+# ==========================================
+def renderizar(formato, datos):
+    """(bytes, etapas) del reporte en `formato` ("pdf" o "xlsx"); datos = argumentos de crear_pdf.
+
+    etapas es el resumen() de los tiempos medidos en el proceso de render,
+    que el padre suma a medicion.TOTAL para el panel de depuración.
+    """
+    with medicion.corrida(f"render.{formato}") as medidor:
+        if formato == "xlsx":
+            from nucleo.excel import crear_xlsx
+            contenido = crear_xlsx(*datos)
+        else:
+            from nucleo.pdf import crear_pdf
+            contenido = crear_pdf(*datos)
+    return contenido, medidor.resumen()
+
+
+_BARRERA = None
+
+
+def _iniciar_proceso(barrera):
+    global _BARRERA
+    _BARRERA = barrera
+    from nucleo.pdf import obtener_plantilla
+    obtener_plantilla()
+
+
+def _esperar_hermanos():
+    """Tarea de arranque: no termina hasta que todos los procesos del pool existen.
+
+    Devuelve el archivo que el proceso ejecutó como __main__ (None si arrancó
+    con el __main__ neutro).
+    """
+    _BARRERA.wait(timeout=120)
+    return getattr(sys.modules["__main__"], "__file__", None)
+
+
+# Un solo lanzamiento de procesos a la vez en todo el servidor
+_LANZAMIENTO = threading.Lock()
+INTENTOS_ARRANQUE = 3
+
+
+@contextmanager
+def _sin_main():
+    """Oculta el __main__ del padre mientras se lanzan los procesos.
+
+    spawn vuelve a ejecutar en cada proceso nuevo el archivo del __main__ del
+    padre; bajo Streamlit ese es app1.py, que no debe correr en los workers.
+    Devuelve una función que vuelve a instalar el módulo neutro: Streamlit
+    reasigna sys.modules["__main__"] al empezar cada rerun de cualquier sesión.
+    """
+    principal = sys.modules["__main__"]
+    neutro = types.ModuleType("__main__")
+
+    def neutralizar():
+        sys.modules["__main__"] = neutro
+
+    with _LANZAMIENTO:
+        neutralizar()
+        try:
+            yield neutralizar
+        finally:
+            # Si otro rerun ya instaló su propio __main__ entretanto, se respeta
+            if sys.modules.get("__main__") is neutro:
+                sys.modules["__main__"] = principal
+
+
+# ==========================================
+# POOL CON COLA ACOTADA Y PEDIDOS COMPARTIDOS
+# ==========================================
+class PoolRender:
+    """Procesos de render con cola acotada; los pedidos iguales comparten trabajo.
+
+    enviar() no bloquea; estado() dice si la clave está lista (con los bytes),
+    generándose, en cola (con su posición) o falló. Los resultados quedan en
+    `cache` (CacheLRU) para las descargas siguientes con los mismos datos; la
+    caché guarda al menos workers + max_cola entradas, así un resultado no se
+    descarta antes de que la sesión que lo pidió vuelva a consultar.
+    procesos=False usa hilos (comparaciones y entornos sin multiprocessing).
+    """
+
+    def __init__(self, workers=None, max_cola=None, cache=None, procesos=True):
+        self.workers = workers or WORKERS
+        self.max_cola = MAX_COLA if max_cola is None else max_cola
+        self.cache = cache if cache is not None else CacheLRU()
+        self.cache.max_entradas = max(self.cache.max_entradas, self.workers + self.max_cola)
+        self.procesos = procesos
+        self._ejecutor = None
+        self._pendientes = OrderedDict()  # clave -> Future, en orden de llegada
+        self._errores = {}
+        self._lock = threading.Lock()
+        self.enviados = self.coalescidos = self.rechazados = self.completados = 0
+
+    def _obtener_ejecutor(self):
+        if self._ejecutor is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+            if self.procesos:
+                import multiprocessing
+
+                # spawn: el servidor de Streamlit tiene hilos y un fork desde ahí puede quedar bloqueado.
+                # Con spawn el pool lanza los procesos de a uno, en cada submit que no encuentra uno
+                # libre. Se le mandan `workers` tareas que se bloquean en una barrera hasta que todos
+                # existen: así los lanza todos aquí, sin __main__, y ningún submit posterior lanza
+                # otro. Tras un BrokenProcessPool el pool nuevo vuelve a pasar por aquí.
+                contexto = multiprocessing.get_context("spawn")
+                for intento in range(1, INTENTOS_ARRANQUE + 1):
+                    barrera = contexto.Barrier(self.workers)
+                    ejecutor = ProcessPoolExecutor(self.workers, mp_context=contexto,
+                                                   initializer=_iniciar_proceso, initargs=(barrera,))
+                    with _sin_main() as neutralizar:
+                        arranques = []
+                        for _ in range(self.workers):
+                            neutralizar()
+                            arranques.append(ejecutor.submit(_esperar_hermanos))
+                    # Un rerun de otra sesión pudo reinstalar app1.py como __main__ justo antes de
+                    # lanzar algún proceso: si alguno lo ejecutó, se descarta el pool entero.
+                    ejecutados = [f for f in (a.result() for a in arranques) if f is not None]
+                    if not ejecutados:
+                        break
+                    log.warning("Proceso de render arrancó ejecutando %s (intento %d de %d); se relanza el pool",
+                                ejecutados[0], intento, INTENTOS_ARRANQUE)
+                    if intento < INTENTOS_ARRANQUE:
+                        ejecutor.shutdown(wait=True)
+                self._ejecutor = ejecutor
+            else:
+                self._ejecutor = ThreadPoolExecutor(self.workers, thread_name_prefix="render")
+        return self._ejecutor
+
+    def enviar(self, clave, formato, datos):
+        """Encola el render. Devuelve "enviado", "coalescido", "listo" o "lleno" (cola a tope)."""
+        with self._lock:
+            if clave in self._pendientes:
+                self.coalescidos += 1
+                return "coalescido"
+            if self.cache.obtener(clave) is not None:
+                return "listo"
+            if len(self._pendientes) >= self.workers + self.max_cola:
+                self.rechazados += 1
+                return "lleno"
+            self._errores.pop(clave, None)
+            futuro = self._obtener_ejecutor().submit(renderizar, formato, datos)
+            self._pendientes[clave] = futuro
+            self.enviados += 1
+        # Fuera del lock: si ya terminó, el callback corre aquí mismo y lo toma
+        futuro.add_done_callback(lambda f: self._terminar(clave, f))
+        return "enviado"
+
+    def _terminar(self, clave, futuro):
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            datos, etapas = futuro.result()
+        except Exception as e:
+            log.warning("No se pudo generar el reporte %s: %s", clave[:12], e)
+            with self._lock:
+                self._errores[clave] = str(e) or type(e).__name__
+                if isinstance(e, BrokenProcessPool):
+                    self._ejecutor = None  # el siguiente pedido arranca procesos nuevos
+        else:
+            if self.procesos:  # con hilos las etapas ya quedaron en el TOTAL de este proceso
+                medicion.TOTAL.sumar(etapas)
+            self.cache.guardar(clave, datos)  # antes de sacarlo de pendientes: estado() nunca ve un hueco
+        with self._lock:
+            self._pendientes.pop(clave, None)
+            self.completados += 1
+
+    def estado(self, clave):
+        """("listo", bytes) | ("generando", 0) | ("en_cola", posición) | ("error", mensaje) | ("nuevo", None)."""
+        with self._lock:
+            if clave in self._pendientes:
+                pos = list(self._pendientes).index(clave) - self.workers + 1
+                return ("en_cola", pos) if pos > 0 else ("generando", 0)
+            if clave in self._errores:
+                return "error", self._errores[clave]
+        datos = self.cache.obtener(clave)
+        return ("listo", datos) if datos is not None else ("nuevo", None)
+
+    def esperar(self, clave, timeout=None):
+        """Bytes de la clave, esperando si está pendiente (lotes y pruebas de carga)."""
+        with self._lock:
+            futuro = self._pendientes.get(clave)
+        if futuro is not None:
+            return futuro.result(timeout)[0]
+        return self.cache.obtener(clave)
+
+    def estadisticas(self):
+        with self._lock:
+            pendientes = len(self._pendientes)
+            return {
+                "workers": self.workers,
+                "en_curso": min(pendientes, self.workers),
+                "en_cola": max(0, pendientes - self.workers),
+                "max_cola": self.max_cola,
+                "enviados": self.enviados,
+                "coalescidos": self.coalescidos,
+                "rechazados": self.rechazados,
+                "completados": self.completados,
+                "errores": len(self._errores),
+            }
+
+    def cerrar(self):
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=True, cancel_futures=True)
+            self._ejecutor = None